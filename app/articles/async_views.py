@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.shortcuts import get_object_or_404
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+
+from app.articles.models import Article
+from app.articles.serializers import ArticleSerializer, ArticleStatSerializer
+from app.async_api import async_read_view
+
+
+@async_read_view()
+def article_list(request: Request) -> Any:
+    paginator = PageNumberPagination()
+    page = paginator.paginate_queryset(Article.objects.for_listing(), request)
+    serializer = ArticleSerializer(
+        page, many=True, context={"request": request}
+    )
+    return paginator.get_paginated_response(serializer.data).data
+
+
+@async_read_view(authenticated=True)
+def article_detail(request: Request, slug: str) -> Any:
+    article = get_object_or_404(Article.objects.for_listing(), slug=slug)
+    return ArticleSerializer(article, context={"request": request}).data
+
+
+@async_read_view(authenticated=True)
+def article_stats(request: Request, slug: str) -> Any:
+    paginator = PageNumberPagination()
+    page = paginator.paginate_queryset(
+        Article.objects.filter(slug=slug), request
+    )
+    serializer = ArticleStatSerializer(
+        page, many=True, context={"request": request}
+    )
+    return paginator.get_paginated_response(serializer.data).data
@@ -0,0 +1,75 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from app.cache import lock_cache
+from app.user.models import UserFollowing
+
+PROFILE_PAGE_RELATIONSHIPS = ("self", "following", "other")
+TRENDING_KEY = "articles:trending"
+POPULAR_TAGS_KEY = "tags:popular"
+FRONT_PAGE_KEY = "front-page"
+FRONT_PAGE_POSTS_KEY = "front-page:posts"
+FRONT_PAGE_STALE_KEY = "front-page:stale"
+
+
+def article_payload_key(slug: str) -> str:
+    return f"article:{slug}"
+
+
+def article_stats_key(slug: str) -> str:
+    return f"article-stats:{slug}"
+
+
+def invalidate_article(slug: Any) -> None:
+    if slug:
+        cache.delete_many([article_payload_key(slug), article_stats_key(slug)])
+
+
+def profile_page_key(author_id: Any, relationship: str) -> str:
+    return f"profile-page:{author_id}:{relationship}"
+
+
+def profile_page_relationship(viewer: Any, author_id: Any) -> str:
+    """
+    How the viewer relates to the author, which decides the cached variant
+    of the author's page they are served
+    """
+    if str(viewer.pk) == str(author_id):
+        return "self"
+    following = UserFollowing.objects.filter(
+        follower=viewer, followed_id=author_id
+    ).exists()
+    return "following" if following else "other"
+
+
+def invalidate_profile_page(author_id: Any) -> None:
+    cache.delete_many(
+        [
+            profile_page_key(author_id, relationship)
+            for relationship in PROFILE_PAGE_RELATIONSHIPS
+        ]
+    )
+
+
+def on_front_page(post_id: Any) -> bool:
+    """
+    Whether the article is listed by the front page snapshot, assuming it
+    is when the listed articles are not known
+    """
+    posts = cache.get(FRONT_PAGE_POSTS_KEY)
+    return posts is None or str(post_id) in posts
+
+
+def mark_front_page_stale() -> None:
+    """
+    Have the next reader of the front page rebuild it. The mark is kept
+    in the shared cache, past the in-process tier, so it is cleared for
+    every worker by the rebuild.
+    """
+    lock_cache().set(FRONT_PAGE_STALE_KEY, 1, settings.FRONT_PAGE_TIMEOUT)
+
+
+def front_page_is_stale() -> bool:
+    return lock_cache().get(FRONT_PAGE_STALE_KEY) is not None
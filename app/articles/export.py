@@ -0,0 +1,97 @@
+import json
+import zlib
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef
+
+from app.articles.models import Article, subquery_count
+
+EXPORT_FIELDS = (
+    "post_id",
+    "slug",
+    "title",
+    "description",
+    "body",
+    "image",
+    "reading_time",
+    "created_at",
+    "updated_at",
+)
+
+
+def export_queryset() -> Any:
+    """
+    Articles with their author username and counts, in a stable order
+    """
+    return (
+        Article.objects.order_by("post_id")
+        .annotate(
+            favourite_count=subquery_count(
+                Article.favourite.through.objects.filter(
+                    article_id=OuterRef("pk")
+                ),
+                "article_id",
+            ),
+            unfavourite_count=subquery_count(
+                Article.unfavourite.through.objects.filter(
+                    article_id=OuterRef("pk")
+                ),
+                "article_id",
+            ),
+        )
+        .values(
+            *EXPORT_FIELDS,
+            "author__username",
+            "favourite_count",
+            "unfavourite_count",
+        )
+    )
+
+
+def tags_for(post_ids: List[Any]) -> Dict[Any, List[str]]:
+    """
+    Tag names of a chunk of articles in one query
+    """
+    tags: Dict[Any, List[str]] = defaultdict(list)
+    rows = Article.tags.through.objects.filter(
+        article_id__in=post_ids
+    ).values_list("article_id", "tag__name")
+    for article_id, name in rows:
+        tags[article_id].append(name)
+    return tags
+
+
+def export_articles(chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every article as a dict, holding one chunk in memory at a time
+    """
+    rows = export_queryset().iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        tags = tags_for([row["post_id"] for row in chunk])
+        for row in chunk:
+            row["author"] = row.pop("author__username")
+            row["tags"] = tags.get(row["post_id"], [])
+            yield row
+
+
+def ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    for row in rows:
+        yield (json.dumps(row, cls=DjangoJSONEncoder) + "\n").encode()
+
+
+def gzip_stream(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress a stream of bytes into a gzip stream as it is produced
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for line in lines:
+        data = compressor.compress(line)
+        if data:
+            yield data
+    yield compressor.flush()
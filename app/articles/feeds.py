@@ -0,0 +1,85 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from app.articles.caches import (
+    POPULAR_TAGS_KEY,
+    TRENDING_KEY,
+    article_payload_key,
+    article_stats_key,
+)
+from app.articles.models import Article, Tag
+from app.articles.serializers import ArticleSerializer, ArticleStatSerializer
+from app.cache import get_or_compute
+
+# Cached payloads are shared by every viewer, who get their own flags
+# overlaid when the payload is served
+SHARED_CONTEXT = {"viewer_state": False}
+
+
+def build_article_payload(slug: str) -> Optional[Dict]:
+    article = Article.objects.for_listing().filter(slug=slug).first()
+    if article is None:
+        return None
+    return ArticleSerializer(article, context=SHARED_CONTEXT).data
+
+
+def article_payload(slug: str) -> Optional[Dict]:
+    return get_or_compute(
+        article_payload_key(slug),
+        lambda: build_article_payload(slug),
+        settings.ARTICLE_CACHE_TIMEOUT,
+    )
+
+
+def build_article_stats(slug: str) -> List[Dict]:
+    articles = Article.objects.filter(slug=slug)
+    return ArticleStatSerializer(articles, many=True).data
+
+
+def article_stats(slug: str) -> List[Dict]:
+    return get_or_compute(
+        article_stats_key(slug),
+        lambda: build_article_stats(slug),
+        settings.ARTICLE_STATS_CACHE_TIMEOUT,
+    )
+
+
+def build_trending() -> List[Dict]:
+    """
+    The most favourited articles published within the trending window
+    """
+    since = timezone.now() - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+    articles = (
+        Article.objects.for_listing()
+        .filter(created_at__gte=since)
+        .order_by("-favourite_total", "-created_at")[: settings.TRENDING_SIZE]
+    )
+    return ArticleSerializer(articles, many=True, context=SHARED_CONTEXT).data
+
+
+def trending_articles() -> List[Dict]:
+    return get_or_compute(
+        TRENDING_KEY, build_trending, settings.TRENDING_CACHE_TIMEOUT
+    )
+
+
+def build_popular_tags() -> List[Dict[str, Any]]:
+    """
+    The tags used by the most articles
+    """
+    tags = (
+        Tag.objects.annotate(articles=Count("tags"))
+        .filter(articles__gt=0)
+        .order_by("-articles", "name")[: settings.POPULAR_TAGS_SIZE]
+    )
+    return [{"name": tag.name, "articles": tag.articles} for tag in tags]
+
+
+def popular_tags() -> List[Dict[str, Any]]:
+    return get_or_compute(
+        POPULAR_TAGS_KEY, build_popular_tags, settings.POPULAR_TAGS_TIMEOUT
+    )
@@ -0,0 +1,45 @@
+import gzip
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.articles.models import Article
+from app.articles.serializers import ArticleSerializer
+from app.middleware import brotli
+from app.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Report the bytes saved by compressing a page of the article list"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        articles = Article.objects.for_listing()[
+            : settings.REST_FRAMEWORK["PAGE_SIZE"]
+        ]
+        content = FastJSONRenderer().render(
+            ArticleSerializer(
+                articles, many=True, context={"viewer_state": False}
+            ).data
+        )
+        codecs = {
+            "gzip": lambda data: gzip.compress(
+                data, compresslevel=settings.COMPRESSION_GZIP_LEVEL
+            )
+        }
+        if brotli is not None:
+            codecs["br"] = lambda data: brotli.compress(
+                data, quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+
+        self.stdout.write(f"identity {len(content):>10} bytes")
+        for name, compress in codecs.items():
+            started = time.perf_counter()
+            compressed = compress(content)
+            elapsed = (time.perf_counter() - started) * 1000
+            saved = 1 - len(compressed) / max(len(content), 1)
+            self.stdout.write(
+                f"{name:<8} {len(compressed):>10} bytes "
+                f"{saved:>7.1%} saved {elapsed:>8.2f} ms"
+            )
@@ -0,0 +1,74 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandParser
+
+
+def fetch(url: str, token: Optional[str]) -> Optional[float]:
+    """
+    Time one request, returning None when it fails
+    """
+    request = Request(url)
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    started = time.perf_counter()
+    try:
+        with urlopen(request, timeout=30) as response:
+            response.read()
+    except (URLError, OSError):
+        return None
+    return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure throughput and latency of running endpoints at several "
+        "levels of concurrency, e.g. the WSGI and ASGI deployments"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("urls", nargs="+")
+        parser.add_argument(
+            "--concurrency", type=int, nargs="+", default=[1, 10, 50]
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--token", help="Access token to send")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            f"{'url':<50} {'conc':>5} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'errors':>6}"
+        )
+        for url in options["urls"]:
+            for concurrency in options["concurrency"]:
+                self.run(url, concurrency, options["requests"], options)
+
+    def run(
+        self, url: str, concurrency: int, total: int, options: Any
+    ) -> None:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            started = time.perf_counter()
+            results = list(
+                executor.map(
+                    lambda _: fetch(url, options["token"]), range(total)
+                )
+            )
+            elapsed = time.perf_counter() - started
+        timings: List[float] = sorted(
+            result for result in results if result is not None
+        )
+        errors = total - len(timings)
+        if timings:
+            p50 = statistics.median(timings) * 1000
+            p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        else:
+            p50 = p95 = 0.0
+        self.stdout.write(
+            f"{url[-50:]:<50} {concurrency:>5} "
+            f"{len(timings) / elapsed:>9.1f} {p50:>8.1f} {p95:>8.1f} "
+            f"{errors:>6}"
+        )
@@ -0,0 +1,70 @@
+import logging
+import time
+from typing import Any, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import Client, override_settings
+
+# The API exempt middleware and the Django middleware each one wraps
+EXEMPT_MIDDLEWARE = {
+    "app.middleware.ApiExemptSessionMiddleware": (
+        "django.contrib.sessions.middleware.SessionMiddleware"
+    ),
+    "app.middleware.ApiExemptCsrfViewMiddleware": (
+        "django.middleware.csrf.CsrfViewMiddleware"
+    ),
+    "app.middleware.ApiExemptAuthenticationMiddleware": (
+        "django.contrib.auth.middleware.AuthenticationMiddleware"
+    ),
+    "app.middleware.ApiExemptMessageMiddleware": (
+        "django.contrib.messages.middleware.MessageMiddleware"
+    ),
+}
+
+
+def full_stack() -> List[str]:
+    """
+    The configured middleware with every API exempt class replaced by
+    the Django middleware it wraps
+    """
+    return [EXEMPT_MIDDLEWARE.get(path, path) for path in settings.MIDDLEWARE]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per request overhead of the full middleware stack "
+        "with the lean stack used for API routes"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--path",
+            default=f"{settings.API_PATH_PREFIX}benchmark/",
+            help="Path to request; unknown paths isolate the middleware",
+        )
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--host", default="localhost")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        profiles = {"full": full_stack(), "lean": settings.MIDDLEWARE}
+        # Keep the not found warnings out of the timings
+        logging.disable(logging.WARNING)
+        try:
+            for name, middleware in profiles.items():
+                self.run(name, middleware, options)
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def run(self, name: str, middleware: List[str], options: Any) -> None:
+        with override_settings(MIDDLEWARE=middleware):
+            client = Client(HTTP_HOST=options["host"])
+            client.get(options["path"])
+            started = time.perf_counter()
+            for _ in range(options["requests"]):
+                client.get(options["path"])
+            elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{name:<5} {elapsed / options['requests'] * 1e6:>9.1f} "
+            "us per request"
+        )
@@ -0,0 +1,42 @@
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from rest_framework.renderers import JSONRenderer
+
+from app.articles.models import Article
+from app.articles.serializers import ArticleSerializer
+from app.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+
+
+class Command(BaseCommand):
+    help = "Time each API renderer on a full page of articles"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        articles = Article.objects.for_listing()[
+            : settings.REST_FRAMEWORK["PAGE_SIZE"]
+        ]
+        data = ArticleSerializer(
+            articles, many=True, context={"viewer_state": False}
+        ).data
+        candidates = [JSONRenderer(), FastJSONRenderer()]
+        if msgpack is not None:
+            candidates.append(MessagePackRenderer())
+
+        self.stdout.write(
+            f"{len(data)} articles, {options['iterations']} iterations"
+        )
+        for renderer in candidates:
+            started = time.perf_counter()
+            for _ in range(options["iterations"]):
+                output = renderer.render(data)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{type(renderer).__name__:<22} "
+                f"{elapsed / options['iterations'] * 1000:>8.3f} ms "
+                f"{len(output):>8} bytes"
+            )
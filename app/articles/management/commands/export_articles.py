@@ -0,0 +1,37 @@
+import sys
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from app.articles.export import export_articles, gzip_stream, ndjson_lines
+
+
+class Command(BaseCommand):
+    help = "Stream every article as newline delimited JSON"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="File to write to, standard output by default",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--gzip", action="store_true", help="Compress the output"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stream = ndjson_lines(export_articles(options["chunk_size"]))
+        if options["gzip"]:
+            stream = gzip_stream(stream)
+        if options["output"] == "-":
+            for data in stream:
+                sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+            return
+        with open(options["output"], "wb") as output:
+            for data in stream:
+                output.write(data)
+        self.stderr.write(
+            self.style.SUCCESS(f"Exported articles to {options['output']}")
+        )
@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from drf_yasg.renderers import OpenAPIRenderer
+
+from app.schema import (
+    SCHEMA_EXTENSIONS,
+    code_version,
+    render_schema,
+    schema_key,
+    schema_path,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the OpenAPI schema of the current code version to a file "
+        "and the shared cache so it is not introspected on request"
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        settings.SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in settings.SCHEMA_CACHE_DIR.glob("openapi-*"):
+            stale.unlink()
+        renderer = OpenAPIRenderer()
+        extension = SCHEMA_EXTENSIONS[renderer.format]
+        content = render_schema(renderer)
+        schema_path(extension).write_bytes(content)
+        cache.set(schema_key(extension), content, None)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote the schema for version {code_version()} "
+                f"to {settings.SCHEMA_CACHE_DIR}"
+            )
+        )
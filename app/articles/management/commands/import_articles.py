@@ -0,0 +1,139 @@
+import json
+import time
+import uuid
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from app.articles.caches import invalidate_profile_page
+from app.articles.models import (
+    Article,
+    Tag,
+    article_reading_time,
+    article_slug,
+)
+from app.articles.snapshots import regenerate_front_page
+
+User = get_user_model()
+
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path) as source:
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = "Bulk create articles and their tags from an NDJSON file"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rows = read_rows(options["path"])
+        created = skipped = 0
+        started = time.perf_counter()
+        while True:
+            batch = list(islice(rows, options["batch_size"]))
+            if not batch:
+                break
+            batch_created = self.import_batch(batch)
+            created += batch_created
+            skipped += len(batch) - batch_created
+        if created:
+            regenerate_front_page()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} articles, skipped {skipped} "
+                f"in {elapsed:.2f}s ({created / max(elapsed, 1e-9):.0f}/s)"
+            )
+        )
+
+    def import_batch(self, batch: List[Dict[str, Any]]) -> int:
+        authors = dict(
+            User.objects.filter(
+                username__in={row.get("author") for row in batch}
+            ).values_list("username", "id")
+        )
+        batch = [
+            row
+            for row in batch
+            if row.get("title")
+            and row.get("body")
+            and row.get("author") in authors
+        ]
+        tags = self.resolve_tags(
+            {name for row in batch for name in row.get("tags", [])}
+        )
+
+        articles = []
+        for row in batch:
+            post_id = uuid.UUID(row.get("post_id") or str(uuid.uuid4()))
+            articles.append(
+                Article(
+                    post_id=post_id,
+                    title=row["title"],
+                    description=row.get("description"),
+                    body=row["body"],
+                    slug=row.get("slug")
+                    or article_slug(row["title"], post_id),
+                    reading_time=article_reading_time(row["body"]),
+                    author_id=authors[row["author"]],
+                )
+            )
+
+        post_ids = [article.post_id for article in articles]
+        with transaction.atomic():
+            existing = set(
+                Article.objects.filter(post_id__in=post_ids).values_list(
+                    "post_id", flat=True
+                )
+            )
+            Article.objects.bulk_create(articles, ignore_conflicts=True)
+            inserted = (
+                set(
+                    Article.objects.filter(post_id__in=post_ids).values_list(
+                        "post_id", flat=True
+                    )
+                )
+                - existing
+            )
+            Article.tags.through.objects.bulk_create(
+                [
+                    Article.tags.through(
+                        article_id=article.post_id, tag_id=tags[name]
+                    )
+                    for row, article in zip(batch, articles)
+                    if article.post_id in inserted
+                    for name in set(row.get("tags", []))
+                ],
+                ignore_conflicts=True,
+            )
+
+        for author_id in {article.author_id for article in articles}:
+            invalidate_profile_page(author_id)
+        return len(inserted)
+
+    def resolve_tags(self, names: set) -> Dict[str, int]:
+        """
+        Map tag names to ids, creating the missing tags in bulk
+        """
+        tags = dict(
+            Tag.objects.filter(name__in=names).values_list("name", "id")
+        )
+        missing = names - set(tags)
+        if missing:
+            Tag.objects.bulk_create(
+                [Tag(name=name) for name in missing], ignore_conflicts=True
+            )
+            tags.update(
+                Tag.objects.filter(name__in=missing).values_list("name", "id")
+            )
+        return tags
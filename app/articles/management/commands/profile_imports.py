@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+BOOT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """
+    The (module, self us, cumulative us) rows of python -X importtime
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the import time of a fresh worker boot, the way gunicorn "
+        "starts one, aggregated per top level package"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument(
+            "--modules",
+            action="store_true",
+            help="List single modules by cumulative time instead",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            self.stderr.write(result.stderr[-2000:])
+            return
+        rows = parse_importtime(result.stderr)
+        total = sum(own for _, own, _ in rows)
+
+        if options["modules"]:
+            ranked = sorted(rows, key=lambda row: row[2], reverse=True)
+            for name, _, cumulative in ranked[: options["top"]]:
+                self.stdout.write(f"{cumulative / 1000:>9.1f} ms  {name}")
+        else:
+            packages: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+            for name, own, _ in rows:
+                package = packages[name.split(".")[0]]
+                package[0] += own
+                package[1] += 1
+            ranked_packages = sorted(
+                packages.items(), key=lambda item: item[1][0], reverse=True
+            )
+            for name, (own, count) in ranked_packages[: options["top"]]:
+                self.stdout.write(
+                    f"{own / 1000:>9.1f} ms {count:>5} modules  {name}"
+                )
+        self.stdout.write(
+            f"{total / 1000:>9.1f} ms total across {len(rows)} modules"
+        )
@@ -0,0 +1,137 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import connections
+from drf_yasg.renderers import OpenAPIRenderer
+
+from app.articles.caches import (
+    POPULAR_TAGS_KEY,
+    TRENDING_KEY,
+    article_payload_key,
+)
+from app.articles.feeds import (
+    build_article_payload,
+    build_popular_tags,
+    build_trending,
+)
+from app.articles.models import Article
+from app.articles.snapshots import regenerate_front_page
+from app.cache import is_process_local, store_computed
+from app.schema import SCHEMA_EXTENSIONS, render_schema, schema_key
+
+
+def warm_trending() -> List[Dict]:
+    articles = build_trending()
+    store_computed(TRENDING_KEY, articles, settings.TRENDING_CACHE_TIMEOUT)
+    return articles
+
+
+def warm_popular_tags() -> None:
+    store_computed(
+        POPULAR_TAGS_KEY, build_popular_tags(), settings.POPULAR_TAGS_TIMEOUT
+    )
+
+
+def warm_article(slug: str) -> None:
+    payload = build_article_payload(slug)
+    if payload is not None:
+        store_computed(
+            article_payload_key(slug), payload, settings.ARTICLE_CACHE_TIMEOUT
+        )
+
+
+def warm_schema() -> None:
+    renderer = OpenAPIRenderer()
+    extension = SCHEMA_EXTENSIONS[renderer.format]
+    cache.set(schema_key(extension), render_schema(renderer), None)
+
+
+def timed(job: Callable[[], Any]) -> Tuple[float, Any]:
+    """
+    Run a job on a pool thread, closing the thread's database connection
+    once it is done
+    """
+    started = time.perf_counter()
+    try:
+        result = job()
+        return time.perf_counter() - started, result
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the trending, popular tag, hot article and schema caches "
+        "after a deploy so the first requests do not find them cold"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--workers", type=int, default=settings.WARM_CACHES_WORKERS
+        )
+        parser.add_argument(
+            "--recent",
+            type=int,
+            default=20,
+            help="Latest articles warmed besides the trending ones",
+        )
+        parser.add_argument("--skip-schema", action="store_true")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if is_process_local(caches["default"]):
+            raise CommandError(
+                "The default cache is local to this process, so the values "
+                "warmed here would never reach the web workers"
+            )
+        started = time.perf_counter()
+        timings: Dict[str, List[float]] = defaultdict(list)
+        jobs: Dict[str, Callable[[], Any]] = {
+            "trending": warm_trending,
+            "popular tags": warm_popular_tags,
+            "front page": regenerate_front_page,
+        }
+        if not options["skip_schema"]:
+            jobs["schema"] = warm_schema
+        recent = Article.objects.values_list("slug", flat=True)[
+            : options["recent"]
+        ]
+        slugs = set(recent)
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = {
+                executor.submit(timed, job): name for name, job in jobs.items()
+            }
+            for future in as_completed(futures):
+                elapsed, result = future.result()
+                timings[futures[future]].append(elapsed)
+                if futures[future] == "trending":
+                    slugs.update(item["slug"] for item in result)
+
+            articles = [
+                executor.submit(timed, lambda slug=slug: warm_article(slug))
+                for slug in slugs
+                if slug
+            ]
+            for future in as_completed(articles):
+                timings["article details"].append(future.result()[0])
+
+        self.stdout.write(f"{'cache':<16} {'entries':>7} {'ms':>9}")
+        for name, elapsed in timings.items():
+            self.stdout.write(
+                f"{name:<16} {len(elapsed):>7} {sum(elapsed) * 1000:>9.1f}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {len(timings)} caches in "
+                f"{(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+        )
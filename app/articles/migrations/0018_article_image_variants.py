@@ -0,0 +1,18 @@
+# Generated by Django 4.0.5 on 2026-10-19 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0017_merge_20220811_0726"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
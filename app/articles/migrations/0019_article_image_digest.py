@@ -0,0 +1,20 @@
+# Generated by Django 4.0.5 on 2026-10-19 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0018_article_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="image_digest",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=64
+            ),
+        ),
+    ]
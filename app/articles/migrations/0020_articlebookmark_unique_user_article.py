@@ -0,0 +1,45 @@
+# Generated by Django 4.0.5 on 2026-10-19 11:36
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_bookmarks(apps, schema_editor):
+    """
+    Keep the earliest bookmark of each reader and article
+    """
+    ArticleBookmark = apps.get_model("articles", "ArticleBookmark")
+    duplicates = (
+        ArticleBookmark.objects.values("user", "article")
+        .annotate(first=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        ArticleBookmark.objects.filter(
+            user=duplicate["user"], article=duplicate["article"]
+        ).exclude(id=duplicate["first"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0019_article_image_digest"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_bookmarks, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="articlebookmark",
+            index=models.Index(
+                fields=["user", "-created_at"], name="bookmark_user_created"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="articlebookmark",
+            constraint=models.UniqueConstraint(
+                fields=("user", "article"), name="unique_user_bookmark"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.0.5 on 2026-10-19 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0020_articlebookmark_unique_user_article"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleTombstone",
+            fields=[
+                (
+                    "post_id",
+                    models.UUIDField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["updated_at", "post_id"], name="article_updated"
+            ),
+        ),
+    ]
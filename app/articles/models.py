@@ -1,15 +1,29 @@
 import math
 import uuid
-from typing import Any
+from typing import Any, Dict, Iterable
 
 from cloudinary.models import CloudinaryField
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models.signals import pre_save
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.utils.text import slugify
 
 from app.abstracts import TimeStampedModel, UniversalIdModel
+from app.articles.caches import (
+    invalidate_article,
+    invalidate_profile_page,
+    mark_front_page_stale,
+    on_front_page,
+)
+from app.user.models import Profile, UserFollowing
 
 User = get_user_model()
 
@@ -21,6 +35,43 @@ class Tag(models.Model):
         return self.name
 
 
+def subquery_count(queryset: QuerySet, field: str) -> Coalesce:
+    """
+    Count the rows of a queryset filtered on an OuterRef, as a subquery
+    """
+    counts = (
+        queryset.order_by()
+        .values(field)
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class ArticleQuerySet(models.QuerySet):
+    def for_listing(self) -> "ArticleQuerySet":
+        """
+        Load everything ArticleSerializer renders in a fixed number of
+        queries regardless of the number of articles
+        """
+        favourite = self.model.favourite.through.objects
+        unfavourite = self.model.unfavourite.through.objects
+        return (
+            self.select_related("author")
+            .prefetch_related("tags", "articleratings_set")
+            .annotate(
+                favourite_total=subquery_count(
+                    favourite.filter(article_id=OuterRef("pk")),
+                    "article_id",
+                ),
+                unfavourite_total=subquery_count(
+                    unfavourite.filter(article_id=OuterRef("pk")),
+                    "article_id",
+                ),
+            )
+        )
+
+
 class Article(TimeStampedModel):
     post_id = models.UUIDField(
         default=uuid.uuid4,
@@ -32,6 +83,10 @@ class Article(TimeStampedModel):
     slug = models.SlugField(max_length=400, unique=True, blank=True, null=True)
     title = models.CharField(max_length=400, blank=False, null=False)
     image = CloudinaryField("post_images", blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True)
+    image_digest = models.CharField(
+        max_length=64, blank=True, default="", db_index=True
+    )
     description = models.CharField(max_length=500, blank=True, null=True)
     body = models.TextField()
     tags = models.ManyToManyField(Tag, blank=True, related_name="tags")
@@ -50,22 +105,106 @@ class Article(TimeStampedModel):
         User, on_delete=models.SET_NULL, related_name="author", null=True
     )
 
+    objects = ArticleQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["updated_at", "post_id"], name="article_updated"
+            )
+        ]
 
     def __str__(self) -> str:
         return self.title
 
 
+class ArticleTombstone(models.Model):
+    """
+    Records deleted articles so that syncing clients can drop them
+    """
+
+    post_id = models.UUIDField(primary_key=True, editable=False)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+def article_slug(title: str, post_id: Any) -> str:
+    return slugify(f"{title}-{post_id}")
+
+
+def article_reading_time(body: str) -> int:
+    return math.ceil(body.count(" ") // 200)
+
+
 @receiver(pre_save, sender=Article)
 def slug_pre_save(sender: Any, instance: Any, **kwargs: Any) -> None:
     if instance.slug is None or instance.slug == "":
-        instance.slug = slugify(f"{instance.title}-{instance.post_id}")
+        instance.slug = article_slug(instance.title, instance.post_id)
 
 
 @receiver(pre_save, sender=Article)
 def reading_time_pre_save(sender: Any, instance: Any, **kwargs: Any) -> None:
-    instance.reading_time = math.ceil(instance.body.count(" ") // 200)
+    instance.reading_time = article_reading_time(instance.body)
+
+
+@receiver(post_delete, sender=Article)
+def article_tombstone_post_delete(
+    sender: Any, instance: Any, **kwargs: Any
+) -> None:
+    ArticleTombstone.objects.get_or_create(post_id=instance.post_id)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def article_profile_page_changed(
+    sender: Any, instance: Any, **kwargs: Any
+) -> None:
+    invalidate_profile_page(instance.author_id)
+    invalidate_article(instance.slug)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+@receiver(m2m_changed, sender=Article.favourite.through)
+@receiver(m2m_changed, sender=Article.unfavourite.through)
+def article_relations_changed(
+    sender: Any, instance: Any, reverse: bool, **kwargs: Any
+) -> None:
+    if not reverse:
+        invalidate_article(instance.slug)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def front_page_changed(sender: Any, instance: Any, **kwargs: Any) -> None:
+    # New and deleted articles change the article count, while edits only
+    # matter to the articles the front page lists
+    if kwargs.get("created", True) or on_front_page(instance.post_id):
+        transaction.on_commit(mark_front_page_stale)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def front_page_tags_changed(
+    sender: Any, instance: Any, action: str, reverse: bool, **kwargs: Any
+) -> None:
+    if action.startswith("post_") and (
+        reverse or on_front_page(instance.post_id)
+    ):
+        transaction.on_commit(mark_front_page_stale)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def profile_page_changed(sender: Any, instance: Any, **kwargs: Any) -> None:
+    invalidate_profile_page(instance.user_id)
+
+
+@receiver(post_save, sender=UserFollowing)
+@receiver(post_delete, sender=UserFollowing)
+def following_profile_page_changed(
+    sender: Any, instance: Any, **kwargs: Any
+) -> None:
+    invalidate_profile_page(instance.followed_id)
+    invalidate_profile_page(instance.follower_id)
 
 
 class ArticleBookmark(TimeStampedModel):
@@ -76,6 +215,18 @@ class ArticleBookmark(TimeStampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     article = models.ForeignKey(Article, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "article"], name="unique_user_bookmark"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"], name="bookmark_user_created"
+            )
+        ]
+
 
 class ArticleComment(TimeStampedModel, UniversalIdModel):
     """
@@ -114,3 +265,74 @@ class ArticleRatings(models.Model):
     article = models.ForeignKey(Article, on_delete=models.CASCADE)
     rating = models.IntegerField(default=0)
     rated_by = models.ForeignKey(User, on_delete=models.CASCADE)
+
+
+@receiver(post_save, sender=ArticleRatings)
+@receiver(post_delete, sender=ArticleRatings)
+@receiver(post_save, sender=ArticleComment)
+@receiver(post_delete, sender=ArticleComment)
+@receiver(post_save, sender=ArticleBookmark)
+@receiver(post_delete, sender=ArticleBookmark)
+def article_activity_changed(
+    sender: Any, instance: Any, **kwargs: Any
+) -> None:
+    slug = (
+        Article.objects.filter(pk=instance.article_id)
+        .values_list("slug", flat=True)
+        .first()
+    )
+    invalidate_article(slug)
+
+
+def load_viewer_state(user: Any, articles: Iterable[Any]) -> Dict[Any, Dict]:
+    """
+    Whether the user favourited, unfavourited, bookmarked or rated each
+    article and follows its author, with one IN query per relation
+    """
+    articles = list(articles)
+    state: Dict[Any, Dict] = {
+        article.pk: {
+            "favourited": False,
+            "unfavourited": False,
+            "bookmarked": False,
+            "my_rating": None,
+            "following_author": False,
+        }
+        for article in articles
+    }
+    if not articles or not getattr(user, "is_authenticated", False):
+        return state
+
+    ids = list(state)
+    author_ids = {article.author_id for article in articles} - {None}
+    relations = {
+        "favourited": Article.favourite.through.objects.filter(
+            user_id=user.pk, article_id__in=ids
+        ),
+        "unfavourited": Article.unfavourite.through.objects.filter(
+            user_id=user.pk, article_id__in=ids
+        ),
+        "bookmarked": ArticleBookmark.objects.filter(
+            user_id=user.pk, article_id__in=ids
+        ),
+    }
+    for field, queryset in relations.items():
+        for article_id in queryset.values_list("article_id", flat=True):
+            state[article_id][field] = True
+
+    ratings = ArticleRatings.objects.filter(
+        rated_by_id=user.pk, article_id__in=ids
+    ).order_by("id")
+    for article_id, rating in ratings.values_list("article_id", "rating"):
+        state[article_id]["my_rating"] = rating
+
+    followed = set(
+        UserFollowing.objects.filter(
+            follower_id=user.pk, followed_id__in=author_ids
+        )
+        .order_by()
+        .values_list("followed_id", flat=True)
+    )
+    for article in articles:
+        state[article.pk]["following_author"] = article.author_id in followed
+    return state
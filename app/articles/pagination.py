@@ -0,0 +1,64 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+class BookmarkPagination(CursorPagination):
+    """
+    Keyset pagination over a reader's bookmarks, newest first
+    """
+
+    ordering = "-created_at"
+    page_size = 20
+
+
+class FavouritePagination(CursorPagination):
+    """
+    Keyset pagination over a reader's favourites, newest first. The
+    favourites table has no timestamp, so its increasing id is used.
+    """
+
+    ordering = "-id"
+    page_size = 20
+
+
+def encode_change_cursor(updated_at: datetime, post_id: Any = None) -> str:
+    """
+    Encode the position of the changes feed as an opaque string
+    """
+    value = f"{updated_at.isoformat()}|{post_id or ''}"
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_change_cursor(
+    cursor: str,
+) -> Tuple[datetime, Optional[uuid.UUID]]:
+    """
+    Decode a cursor returned by the changes feed
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor.encode()).decode()
+        updated_at, post_id = value.split("|")
+        return (
+            datetime.fromisoformat(updated_at),
+            uuid.UUID(post_id) if post_id else None,
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError({"cursor": ["Invalid cursor."]})
+
+
+def changed_after(field: str, since: datetime, post_id: Any = None) -> Q:
+    """
+    Rows of the changes feed past a decoded cursor, where `field` holds
+    the time of the change
+    """
+    condition = Q(**{f"{field}__gt": since})
+    if post_id is not None:
+        condition |= Q(**{field: since, "post_id__gt": post_id})
+    return condition
@@ -12,4 +12,4 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(
         self, request: Request, view: APIView, obj: Any
     ) -> bool:
-        return bool(obj.author == request.user)
+        return obj.author_id is not None and obj.author_id == request.user.pk
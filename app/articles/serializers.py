@@ -1,10 +1,14 @@
+import uuid
 from collections import Counter
-from typing import Any
+from typing import Any, Dict, List, Optional
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import models
 from django.db.models import Avg
 from rest_framework import serializers
 
+from app.articles.export import EXPORT_FIELDS
 from app.articles.models import (
     Article,
     ArticleBookmark,
@@ -12,8 +16,10 @@ from app.articles.models import (
     ArticleHighlight,
     ArticleRatings,
     Tag,
+    load_viewer_state,
 )
-from app.user.serializers import UserSerializer
+from app.images import build_srcset, prepare_image, save_image_variants
+from app.user.serializers import ProfileSerializer, UserSerializer
 
 User = get_user_model()
 
@@ -28,7 +34,62 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ("name",)
 
 
+VIEWER_STATE_FIELDS = (
+    "favourited",
+    "unfavourited",
+    "bookmarked",
+    "my_rating",
+    "following_author",
+)
+
+
+def payload_author_id(item: Dict) -> Optional[uuid.UUID]:
+    """
+    The author id of a serialized article, None once the author is deleted
+    """
+    author = item["author"]
+    return uuid.UUID(author["id"]) if author else None
+
+
+def add_viewer_state(user: Any, payload: List[Dict]) -> List[Dict]:
+    """
+    Overlay the viewer's own flags on articles serialized without them,
+    such as cached payloads shared by every viewer
+    """
+    articles = [
+        Article(
+            post_id=uuid.UUID(item["post_id"]),
+            author_id=payload_author_id(item),
+        )
+        for item in payload
+    ]
+    state = load_viewer_state(user, articles)
+    return [
+        {**item, **state[article.pk]}
+        for item, article in zip(payload, articles)
+    ]
+
+
+class ArticleListSerializer(serializers.ListSerializer):
+    """
+    Loads the viewer state for the whole page before rendering it
+    """
+
+    def to_representation(self, data: Any) -> Any:
+        articles = data.all() if isinstance(data, models.Manager) else data
+        articles = list(articles)
+        if self.context.get("viewer_state", True):
+            request = self.context.get("request")
+            child: Any = self.child
+            child.viewer_state = load_viewer_state(
+                getattr(request, "user", None), articles
+            )
+        return super().to_representation(articles)
+
+
 class ArticleSerializer(serializers.ModelSerializer):
+    viewer_state: Optional[Dict[Any, Dict]] = None
+
     post_id = serializers.CharField(
         read_only=True,
     )
@@ -42,6 +103,8 @@ class ArticleSerializer(serializers.ModelSerializer):
         min_length=20,
     )
     image = serializers.ImageField(use_url=True, required=False)
+    image_variants = serializers.JSONField(read_only=True)
+    image_srcset = serializers.SerializerMethodField()
     body = serializers.CharField(
         min_length=20,
     )
@@ -58,9 +121,15 @@ class ArticleSerializer(serializers.ModelSerializer):
     )
     favourite_count = serializers.SerializerMethodField()
     unfavourite_count = serializers.SerializerMethodField()
+    favourited = serializers.SerializerMethodField()
+    unfavourited = serializers.SerializerMethodField()
+    bookmarked = serializers.SerializerMethodField()
+    my_rating = serializers.SerializerMethodField()
+    following_author = serializers.SerializerMethodField()
 
     class Meta:
         model = Article
+        list_serializer_class = ArticleListSerializer
         fields = (
             "post_id",
             "reading_time",
@@ -68,6 +137,8 @@ class ArticleSerializer(serializers.ModelSerializer):
             "title",
             "description",
             "image",
+            "image_variants",
+            "image_srcset",
             "body",
             "tags",
             "taglist",
@@ -75,6 +146,11 @@ class ArticleSerializer(serializers.ModelSerializer):
             "avg_rating",
             "favourite_count",
             "unfavourite_count",
+            "favourited",
+            "unfavourited",
+            "bookmarked",
+            "my_rating",
+            "following_author",
             "created_at",
             "updated_at",
         )
@@ -90,7 +166,9 @@ class ArticleSerializer(serializers.ModelSerializer):
         """set current user as author"""
         validated_data["author"] = self.context.get("request").user  # type: ignore[union-attr]
         taglist = validated_data.pop("taglist")
+        variants = prepare_image(validated_data)
         article = super().create(validated_data)
+        save_image_variants(article, variants)
         tags = []
         for name in taglist.split(","):
             tag, _ = Tag.objects.get_or_create(name=name.strip())
@@ -99,35 +177,66 @@ class ArticleSerializer(serializers.ModelSerializer):
 
         return article
 
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        variants = prepare_image(validated_data)
+        instance = super().update(instance, validated_data)
+        save_image_variants(instance, variants)
+        return instance
+
+    def get_image_srcset(self, instance: Any) -> Any:
+        return build_srcset(instance.image_variants)
+
     def average_rating(self, instance):  # type: ignore[no-untyped-def]
-        avg_rating = (
-            ArticleRatings.objects.filter(article=instance).aggregate(
-                average_rating=Avg("rating")
-            )["average_rating"]
-            or 0
-        )
-        avg_rating = round(avg_rating)
-        total_user_rates = ArticleRatings.objects.filter(
-            article=instance
-        ).count()
-        each_rating = Counter(
-            ArticleRatings.objects.filter(article=instance).values_list(
-                "rating", flat=True
-            )
-        )
+        ratings = [
+            rating.rating for rating in instance.articleratings_set.all()
+        ]
+        avg_rating = round(sum(ratings) / len(ratings)) if ratings else 0
 
         return {
             "avg_rating": avg_rating,
-            "total_user_rates": total_user_rates,
-            "each_rating": each_rating,
+            "total_user_rates": len(ratings),
+            "each_rating": Counter(ratings),
         }
 
     def get_favourite_count(self, instance: Any) -> Any:
+        if hasattr(instance, "favourite_total"):
+            return instance.favourite_total
         return instance.favourite.count()
 
     def get_unfavourite_count(self, instance: Any) -> Any:
+        if hasattr(instance, "unfavourite_total"):
+            return instance.unfavourite_total
         return instance.unfavourite.count()
 
+    def get_viewer_state(self, instance: Any) -> Any:
+        """
+        The viewer state loaded for the page, or for this article alone
+        when it is rendered on its own
+        """
+        if not self.context.get("viewer_state", True):
+            return dict.fromkeys(VIEWER_STATE_FIELDS)
+        if self.viewer_state is None or instance.pk not in self.viewer_state:
+            request = self.context.get("request")
+            self.viewer_state = load_viewer_state(
+                getattr(request, "user", None), [instance]
+            )
+        return self.viewer_state[instance.pk]
+
+    def get_favourited(self, instance: Any) -> Any:
+        return self.get_viewer_state(instance)["favourited"]
+
+    def get_unfavourited(self, instance: Any) -> Any:
+        return self.get_viewer_state(instance)["unfavourited"]
+
+    def get_bookmarked(self, instance: Any) -> Any:
+        return self.get_viewer_state(instance)["bookmarked"]
+
+    def get_my_rating(self, instance: Any) -> Any:
+        return self.get_viewer_state(instance)["my_rating"]
+
+    def get_following_author(self, instance: Any) -> Any:
+        return self.get_viewer_state(instance)["following_author"]
+
 
 class ArticleBookmarkSerializer(serializers.ModelSerializer):
     """
@@ -152,6 +261,65 @@ class ArticleBookmarkSerializer(serializers.ModelSerializer):
         return instance
 
 
+class ArticleBatchSerializer(serializers.Serializer):
+    """
+    Validates the comma separated slugs or post ids of a multi-get
+    """
+
+    ids = serializers.CharField()
+
+    def validate_ids(self, value: str) -> Any:
+        ids = list(dict.fromkeys(item for item in value.split(",") if item))
+        if not ids:
+            raise serializers.ValidationError("Provide at least one id.")
+        if len(ids) > settings.ARTICLE_BATCH_LIMIT:
+            raise serializers.ValidationError(
+                f"Request at most {settings.ARTICLE_BATCH_LIMIT} articles."
+            )
+        return ids
+
+
+class BookmarkImportSerializer(serializers.Serializer):
+    """
+    Serializer for importing bookmarks in bulk
+    """
+
+    articles = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=1000
+    )
+
+    def create(self, validated_data: Any) -> Any:
+        user = self.context["request"].user
+        requested = list(dict.fromkeys(validated_data["articles"]))
+        found = set(
+            Article.objects.filter(post_id__in=requested).values_list(
+                "post_id", flat=True
+            )
+        )
+        ArticleBookmark.objects.bulk_create(
+            [
+                ArticleBookmark(user=user, article_id=article_id)
+                for article_id in requested
+                if article_id in found
+            ],
+            ignore_conflicts=True,
+        )
+        return {
+            "bookmarked": len(found),
+            "missing": [
+                article_id
+                for article_id in requested
+                if article_id not in found
+            ],
+        }
+
+    def to_representation(self, instance: Any) -> Any:
+        return {
+            "bookmarked": instance["bookmarked"],
+            "missing": [str(article_id) for article_id in instance["missing"]],
+        }
+
+
 class ArticleCommentSerializer(serializers.ModelSerializer):
     """
     Comment and highlighting serializer
@@ -348,3 +516,74 @@ class ArticleStatSerializer(serializers.ModelSerializer):
             "unfavourite_count",
             "average_rating",
         ]
+
+
+class PopularTagSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    articles = serializers.IntegerField()
+
+
+class PopularTagsSerializer(serializers.Serializer):
+    """
+    Describes the popular tags response
+    """
+
+    tags = PopularTagSerializer(many=True)
+
+
+class TrendingArticlesSerializer(serializers.Serializer):
+    """
+    Describes the trending articles response
+    """
+
+    articles = ArticleSerializer(many=True)
+
+
+class ArticlePageSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    next = serializers.CharField(allow_null=True)
+    previous = serializers.CharField(allow_null=True)
+    results = ArticleSerializer(many=True)
+
+
+class FrontPageSerializer(serializers.Serializer):
+    """
+    Describes the front page snapshot
+    """
+
+    articles = ArticlePageSerializer()
+    tags = PopularTagSerializer(many=True)
+
+
+class ProfilePageSerializer(serializers.Serializer):
+    """
+    Describes an author's page
+    """
+
+    profile = ProfileSerializer()
+    followers_count = serializers.IntegerField()
+    following_count = serializers.IntegerField()
+    is_following = serializers.BooleanField()
+    articles_count = serializers.IntegerField()
+    articles = ArticleSerializer(many=True)
+
+
+class ArticleExportSerializer(serializers.ModelSerializer):
+    """
+    Describes one line of the article export
+    """
+
+    author = serializers.CharField()
+    favourite_count = serializers.IntegerField()
+    unfavourite_count = serializers.IntegerField()
+    tags = serializers.ListField(child=serializers.CharField())
+
+    class Meta:
+        model = Article
+        fields = [
+            *EXPORT_FIELDS,
+            "author",
+            "favourite_count",
+            "unfavourite_count",
+            "tags",
+        ]
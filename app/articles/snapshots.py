@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.urls import reverse
+
+from app.articles.caches import (
+    FRONT_PAGE_KEY,
+    FRONT_PAGE_POSTS_KEY,
+    FRONT_PAGE_STALE_KEY,
+    front_page_is_stale,
+    mark_front_page_stale,
+)
+from app.articles.feeds import popular_tags
+from app.articles.models import Article
+from app.articles.serializers import ArticleSerializer
+from app.cache import (
+    acquire_lock,
+    get_or_compute,
+    is_locked,
+    lock_cache,
+    release_lock,
+    store_computed,
+)
+from app.renderers import FastJSONRenderer
+
+_refreshing = threading.Lock()
+_pending = threading.Event()
+
+
+def build_front_page() -> bytes:
+    """
+    The first page of all articles as an anonymous reader sees it, plus
+    the popular tags, rendered to JSON. The articles it lists are cached
+    too, so edits to other articles leave it alone.
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    articles = Article.objects.for_listing()
+    count = articles.count()
+    page = list(articles[:page_size])
+    url = reverse("all-articles")
+    content = FastJSONRenderer().render(
+        {
+            "articles": {
+                "count": count,
+                "next": f"{url}?page=2" if count > page_size else None,
+                "previous": None,
+                "results": ArticleSerializer(page, many=True).data,
+            },
+            "tags": popular_tags(),
+        }
+    )
+    cache.set(
+        FRONT_PAGE_POSTS_KEY,
+        [str(article.post_id) for article in page],
+        settings.FRONT_PAGE_TIMEOUT + settings.SINGLE_FLIGHT_STALE_TIMEOUT,
+    )
+    return content
+
+
+def regenerate_front_page() -> None:
+    store_computed(
+        FRONT_PAGE_KEY, build_front_page(), settings.FRONT_PAGE_TIMEOUT
+    )
+
+
+def front_page() -> bytes:
+    """
+    The snapshot of the front page. An expired snapshot, or one marked
+    stale by a change to what it shows, is still served while a fresh one
+    is built in the background.
+    """
+    entry = cache.get(FRONT_PAGE_KEY)
+    if entry is None:
+        return get_or_compute(
+            FRONT_PAGE_KEY, build_front_page, settings.FRONT_PAGE_TIMEOUT
+        )
+    fresh_until, content = entry
+    if fresh_until <= time.time() or front_page_is_stale():
+        refresh_front_page()
+    return content
+
+
+def refresh_front_page() -> Optional[threading.Thread]:
+    """
+    Rebuild the snapshot on a background thread, after waiting
+    FRONT_PAGE_REFRESH_DELAY seconds so a burst of changes is rebuilt
+    once. A thread of this worker already rebuilding it builds it once
+    more when it is done, and so does another worker holding the rebuild
+    lock once it sees the stale mark.
+    """
+    _pending.set()
+    if not _refreshing.acquire(blocking=False):
+        return None
+    if not settings.BACKGROUND_REBUILDS:
+        _refresh()
+        return None
+    thread = threading.Thread(target=_refresh_later, daemon=True)
+    thread.start()
+    return thread
+
+
+def _refresh_later() -> None:
+    time.sleep(settings.FRONT_PAGE_REFRESH_DELAY)
+    try:
+        _refresh()
+    finally:
+        connections.close_all()
+
+
+def _refresh() -> None:
+    lock_key = f"{FRONT_PAGE_KEY}:lock"
+    locks = lock_cache()
+    try:
+        while _pending.is_set():
+            _pending.clear()
+            token = acquire_lock(lock_key)
+            if token is None:
+                # Leave the rebuild to the holder, unless it let go of the
+                # lock before it could see the mark
+                mark_front_page_stale()
+                if not is_locked(lock_key):
+                    _pending.set()
+                continue
+            try:
+                locks.delete(FRONT_PAGE_STALE_KEY)
+                regenerate_front_page()
+            finally:
+                release_lock(lock_key, token)
+            if front_page_is_stale():
+                _pending.set()
+    finally:
+        _refreshing.release()
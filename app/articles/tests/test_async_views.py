@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+from django.urls import reverse
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from app.articles.models import Article
+from app.user.models import Profile
+
+User = get_user_model()
+fake = Faker()
+
+
+class TestAsyncViews(TransactionTestCase):
+    """
+    Tests for the async read endpoints. The handlers query the database
+    from a worker thread, so the data has to be committed.
+    """
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        Profile.objects.create(user=self.user, bio=fake.sentence())
+        self.article = Article.objects.create(
+            title=fake.sentence(),
+            description=fake.paragraph(nb_sentences=1),
+            body=fake.paragraph(),
+            author=self.user,
+        )
+        self.client = APIClient()
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_async_article_list(self) -> None:
+        """
+        Test the async list matches the sync list
+        """
+        response = self.client.get(reverse("async-all-articles"))
+        expected = self.client.get(reverse("all-articles"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected.json())
+
+    def test_async_article_detail(self) -> None:
+        """
+        Test an article is fetched by slug for authenticated readers
+        """
+        url = reverse(
+            "async-article-detail", kwargs={"slug": self.article.slug}
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["post_id"], str(self.article.pk))
+
+        self.client.credentials()
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_async_article_detail_not_found(self) -> None:
+        """
+        Test an unknown slug returns 404
+        """
+        response = self.client.get(
+            reverse("async-article-detail", kwargs={"slug": "missing"})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_async_article_stats(self) -> None:
+        """
+        Test the stats of an article are returned
+        """
+        response = self.client.get(
+            reverse("async-statistics", kwargs={"slug": self.article.slug})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["comment_count"], 0)
+
+    def test_async_profile(self) -> None:
+        """
+        Test users can read their own profile only
+        """
+        response = self.client.get(
+            reverse("async-profile", kwargs={"user": self.user.id})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["username"], self.user.username)
+
+        other = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        Profile.objects.create(user=other)
+        response = self.client.get(
+            reverse("async-profile", kwargs={"user": other.id})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_async_view_is_read_only(self) -> None:
+        """
+        Test writes are not accepted by the async endpoints
+        """
+        response = self.client.post(reverse("async-all-articles"))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+
+    def test_async_view_negotiates_content(self) -> None:
+        """
+        Test the async endpoints honour the Accept header like the others
+        """
+        response = self.client.get(
+            reverse("async-all-articles"), HTTP_ACCEPT="text/csv"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
@@ -0,0 +1,223 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from app.cache import get_or_compute, store_computed
+
+TIERED_CACHES = {
+    "default": {
+        "BACKEND": "app.cache.TieredCache",
+        "LOCATION": "test-shared",
+        "OPTIONS": {"LOCAL_TIMEOUT": 5, "LOCAL_MAX_ENTRIES": 2},
+    },
+    "test-shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-shared",
+        "KEY_PREFIX": "v1",
+    },
+}
+
+
+@override_settings(CACHES=TIERED_CACHES)
+class TestTieredCache(TestCase):
+    """
+    Tests for the in-process tier in front of the shared cache
+    """
+
+    def setUp(self) -> None:
+        self.cache = caches["default"]
+        self.shared = caches["test-shared"]
+        self.cache.clear()
+        self.cache._counters.clear()
+
+    def test_reads_are_served_locally(self) -> None:
+        """
+        Test a value set through the cache is read from process memory
+        """
+        self.cache.set("tags", ["python"])
+        self.shared.delete("tags")
+
+        self.assertEqual(self.cache.get("tags"), ["python"])
+        self.assertEqual(self.cache.stats()["local_hits"], 1)
+
+    def test_shared_hits_fill_the_local_tier(self) -> None:
+        """
+        Test a value written by another worker is kept locally once read
+        """
+        self.shared.set("profile", {"bio": "hi"})
+
+        self.cache.get("profile")
+        self.cache.get("profile")
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["shared_hits"], 1)
+        self.assertEqual(stats["local_hits"], 1)
+
+    def test_local_copies_expire(self) -> None:
+        """
+        Test another worker's invalidation is seen once the local copy
+        expires
+        """
+        self.cache.set("article", "old")
+        self.shared.delete("article")
+
+        with patch("app.cache.time.monotonic", return_value=10**9):
+            self.assertIsNone(self.cache.get("article"))
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """
+        Test the local tier keeps at most LOCAL_MAX_ENTRIES values
+        """
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.shared.clear()
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.stats()["local_entries"], 2)
+
+    def test_delete_clears_both_tiers(self) -> None:
+        """
+        Test a delete is not hidden by the local copy
+        """
+        self.cache.set_many({"a": 1, "b": 2})
+
+        self.cache.delete_many(["a", "b"])
+
+        self.assertEqual(self.cache.get_many(["a", "b"]), {})
+        self.assertIsNone(self.shared.get("a"))
+
+    def test_add_coordinates_through_shared_tier(self) -> None:
+        """
+        Test add only succeeds for the first worker
+        """
+        self.assertTrue(self.cache.add("lock", 1))
+        self.assertFalse(self.cache.add("lock", 1))
+
+    def test_shared_keys_are_versioned(self) -> None:
+        """
+        Test the shared tier keys carry the configured prefix
+        """
+        self.cache.set("tags", ["python"])
+
+        self.assertEqual(self.shared.make_key("tags"), "v1:1:tags")
+        self.assertIn("v1:1:tags", self.shared._cache)
+
+
+@override_settings(CACHES=TIERED_CACHES, SINGLE_FLIGHT_POLL_INTERVAL=0.01)
+class TestGetOrCompute(TestCase):
+    """
+    Tests for rebuilding expensive cached values one caller at a time
+    """
+
+    def setUp(self) -> None:
+        self.cache = caches["default"]
+        self.cache.clear()
+        self.builds = 0
+
+    def build(self) -> str:
+        self.builds += 1
+        time.sleep(0.05)
+        return "fresh"
+
+    def test_concurrent_misses_build_once(self) -> None:
+        """
+        Test threads missing together share a single build
+        """
+        results = []
+        barrier = threading.Barrier(8)
+
+        def request() -> None:
+            barrier.wait()
+            results.append(get_or_compute("payload", self.build, 60))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(results, ["fresh"] * 8)
+
+    def test_fresh_value_is_not_rebuilt(self) -> None:
+        """
+        Test a cached value is returned until it expires
+        """
+        store_computed("payload", "cached", 60)
+
+        self.assertEqual(get_or_compute("payload", self.build, 60), "cached")
+        self.assertEqual(self.builds, 0)
+
+    def test_stale_value_served_during_rebuild(self) -> None:
+        """
+        Test an expired value is served while another worker rebuilds it
+        """
+        self.cache.set("payload", (time.time() - 1, "stale"), 60)
+        self.cache.add("payload:lock", 1)
+
+        self.assertEqual(get_or_compute("payload", self.build, 60), "stale")
+        self.assertEqual(self.builds, 0)
+
+    def test_stale_value_is_rebuilt(self) -> None:
+        """
+        Test an expired value is rebuilt when nobody else is rebuilding it
+        """
+        self.cache.set("payload", (time.time() - 1, "stale"), 60)
+
+        self.assertEqual(get_or_compute("payload", self.build, 60), "fresh")
+        self.assertEqual(self.cache.get("payload")[1], "fresh")
+
+    def test_miss_waits_for_other_worker(self) -> None:
+        """
+        Test a miss waits for the worker holding the lock to cache a value
+        """
+        self.cache.add("payload:lock", 1)
+        threading.Timer(
+            0.05, lambda: store_computed("payload", "theirs", 60)
+        ).start()
+
+        self.assertEqual(get_or_compute("payload", self.build, 60), "theirs")
+        self.assertEqual(self.builds, 0)
+
+    @override_settings(SINGLE_FLIGHT_WAIT=5)
+    def test_wait_ends_when_lock_is_released(self) -> None:
+        """
+        Test a miss stops waiting once the holder is done without caching
+        a value
+        """
+        self.cache.add("payload:lock", 1)
+        threading.Timer(
+            0.05, lambda: self.cache.delete("payload:lock")
+        ).start()
+        started = time.monotonic()
+
+        self.assertIsNone(get_or_compute("payload", lambda: None, 60))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_lock_taken_by_another_worker_is_kept(self) -> None:
+        """
+        Test a build outliving its lock does not release the lock another
+        worker took after it expired
+        """
+
+        def build() -> str:
+            self.cache.delete("payload:lock")
+            self.cache.add("payload:lock", "theirs")
+            return "fresh"
+
+        self.assertEqual(get_or_compute("payload", build, 60), "fresh")
+        self.assertEqual(caches["test-shared"].get("payload:lock"), "theirs")
+
+    def test_missing_objects_are_not_cached(self) -> None:
+        """
+        Test a builder returning None leaves nothing in the cache
+        """
+        self.assertIsNone(get_or_compute("payload", lambda: None, 60))
+        self.assertIsNone(self.cache.get("payload"))
@@ -0,0 +1,219 @@
+import gzip
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils.text import slugify
+from faker import Faker
+
+from app.articles.caches import TRENDING_KEY, article_payload_key
+from app.articles.management.commands.profile_imports import parse_importtime
+from app.articles.models import Article, Tag
+
+User = get_user_model()
+fake = Faker()
+
+
+class TestExportArticles(TestCase):
+    """
+    Tests for the article export command
+    """
+
+    def setUp(self) -> None:
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.tag = Tag.objects.create(name=fake.word())
+        for _ in range(3):
+            article = Article.objects.create(
+                title=fake.sentence(),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+            article.tags.add(self.tag)
+            article.favourite.add(self.author)
+
+    def export(self, *args: str) -> bytes:
+        with tempfile.NamedTemporaryFile(suffix=".ndjson") as output:
+            call_command(
+                "export_articles",
+                "--output",
+                output.name,
+                "--chunk-size",
+                "2",
+                *args,
+                stderr=StringIO(),
+            )
+            return output.read()
+
+    def test_export_articles(self) -> None:
+        """
+        Test every article is written with its tags, author and counts
+        """
+        rows = [json.loads(line) for line in self.export().splitlines()]
+
+        self.assertEqual(len(rows), 3)
+        for row in rows:
+            self.assertEqual(row["author"], self.author.username)
+            self.assertEqual(row["tags"], [self.tag.name])
+            self.assertEqual(row["favourite_count"], 1)
+
+    def test_export_articles_gzip(self) -> None:
+        """
+        Test the gzipped export decompresses to the same lines
+        """
+        lines = gzip.decompress(self.export("--gzip")).splitlines()
+
+        self.assertEqual(len(lines), 3)
+
+
+class TestImportArticles(TestCase):
+    """
+    Tests for the bulk article import command
+    """
+
+    def test_import_articles(self) -> None:
+        """
+        Test articles and tags are created and unknown authors skipped
+        """
+        author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        existing = Tag.objects.create(name="python")
+        rows = [
+            {
+                "title": fake.sentence(),
+                "body": " ".join(fake.words(nb=450)),
+                "author": author.username,
+                "tags": ["python", "django"],
+            },
+            {
+                "title": fake.sentence(),
+                "body": fake.paragraph(),
+                "author": author.username,
+            },
+            {
+                "title": fake.sentence(),
+                "body": fake.paragraph(),
+                "author": "nobody",
+            },
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as source:
+            source.write("\n".join(json.dumps(row) for row in rows))
+            source.flush()
+            out = StringIO()
+            call_command("import_articles", source.name, stdout=out)
+
+        self.assertIn("Created 2 articles, skipped 1", out.getvalue())
+        article = Article.objects.get(title=rows[0]["title"])
+        self.assertEqual(article.reading_time, 2)
+        self.assertEqual(
+            article.slug, slugify(f"{article.title}-{article.post_id}")
+        )
+        self.assertCountEqual(
+            article.tags.values_list("name", flat=True), ["python", "django"]
+        )
+        self.assertEqual(Tag.objects.get(name="python"), existing)
+
+
+class TestProfileImports(TestCase):
+    """
+    Tests for the import time profiler
+    """
+
+    def test_parse_importtime(self) -> None:
+        """
+        Test the importtime report is parsed into rows
+        """
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   django.utils\n"
+            "import time:       300 |        420 | django\n"
+        )
+
+        self.assertEqual(
+            parse_importtime(output),
+            [("django.utils", 120, 120), ("django", 300, 420)],
+        )
+
+    def test_profile_imports(self) -> None:
+        """
+        Test the report groups a worker boot by package
+        """
+        out = StringIO()
+
+        call_command("profile_imports", "--top", "3", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn("total across", lines[-1])
+
+
+class TestWarmCaches(TransactionTestCase):
+    """
+    Tests for the cache warm-up command
+    """
+
+    def setUp(self) -> None:
+        # The command refuses the tests' in-memory cache, which the web
+        # workers could not read
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": (
+                        "django.core.cache.backends.filebased.FileBasedCache"
+                    ),
+                    "LOCATION": directory.name,
+                }
+            }
+        )
+        shared.enable()
+        self.addCleanup(shared.disable)
+        author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.articles = [
+            Article.objects.create(
+                title=fake.sentence(), body=fake.paragraph(), author=author
+            )
+            for _ in range(2)
+        ]
+
+    def test_warm_caches(self) -> None:
+        """
+        Test the caches are filled and timed
+        """
+        out = StringIO()
+
+        call_command("warm_caches", "--skip-schema", stdout=out)
+
+        self.assertEqual(len(cache.get(TRENDING_KEY)[1]), 2)
+        for article in self.articles:
+            _, payload = cache.get(article_payload_key(article.slug))
+            self.assertEqual(payload["title"], article.title)
+        self.assertIn("article details", out.getvalue())
+        self.assertIn("front page", out.getvalue())
+        self.assertIn("Warmed 4 caches", out.getvalue())
+
+    def test_process_local_cache_is_refused(self) -> None:
+        """
+        Test nothing is warmed when the web workers can not see the cache
+        """
+        local = {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "warm-local",
+        }
+        tiered = {
+            "default": {"BACKEND": "app.cache.TieredCache", "LOCATION": "x"},
+            "x": local,
+        }
+        for caches in ({"default": local}, tiered):
+            with override_settings(CACHES=caches):
+                with self.assertRaises(CommandError):
+                    call_command("warm_caches", "--skip-schema")
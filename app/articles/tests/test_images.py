@@ -0,0 +1,165 @@
+import os
+from concurrent.futures import Future
+from typing import Any, Callable, List, Tuple
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.test import TestCase, override_settings
+from faker import Faker
+
+from app.articles.models import Article
+from app.images import (
+    build_srcset,
+    image_digest,
+    prepare_image,
+    save_image_variants,
+    start_image_variants,
+    store_image_variants,
+)
+
+from .mocks import sample_image
+
+fake = Faker()
+
+
+class DeferredExecutor:
+    """
+    Runs submitted jobs only when asked, like a busy process pool
+    """
+
+    def __init__(self) -> None:
+        self.jobs: List[Tuple[Future, Callable, Tuple]] = []
+
+    def submit(self, job: Callable, *args: Any) -> Future:
+        future: Future = Future()
+        self.jobs.append((future, job, args))
+        return future
+
+    def run(self) -> None:
+        for future, job, args in self.jobs:
+            future.set_result(job(*args))
+
+
+@override_settings(IMAGE_VARIANT_WORKERS=0, IMAGE_UPLOAD_WORKERS=0)
+class TestImageVariants(TestCase):
+    """
+    Tests for responsive image variants
+    """
+
+    def test_no_variants_without_image(self) -> None:
+        """
+        Test nothing is rendered when no image was uploaded
+        """
+        self.assertIsNone(start_image_variants(None))
+
+    @patch(
+        "cloudinary.uploader.upload",
+        return_value={"secure_url": fake.image_url()},
+    )
+    def test_save_image_variants(self, upload: Any) -> None:
+        """
+        Test every width and format is uploaded under its own id and stored
+        on the article once it is committed
+        """
+        article = Article.objects.create(
+            title=fake.name(), description=fake.text(), body=fake.text()
+        )
+        updated_at = article.updated_at
+        pending = start_image_variants(sample_image())
+        with self.captureOnCommitCallbacks(execute=True):
+            save_image_variants(article, pending)
+        article.refresh_from_db()
+
+        public_ids = {call.kwargs["public_id"] for call in upload.mock_calls}
+        self.assertEqual(len(public_ids), 6)
+        self.assertGreater(article.updated_at, updated_at)
+        self.assertEqual(
+            set(article.image_variants), {"thumbnail", "medium", "large"}
+        )
+        self.assertEqual(article.image_variants["thumbnail"]["width"], 150)
+        self.assertIn("150w", build_srcset(article.image_variants)["webp"])
+
+    def test_streamed_upload_outlives_request(self) -> None:
+        """
+        Test variants queued behind other work are rendered from a copy
+        that is removed once they are done, not from the request's file
+        """
+        image = sample_image()
+        upload = TemporaryUploadedFile(
+            "tests.png", "image/png", image.size, None
+        )
+        upload.write(image.read())
+        upload.seek(0)
+        executor = DeferredExecutor()
+
+        with patch("app.images.get_executor", return_value=executor):
+            pending = start_image_variants(upload)
+        upload.close()
+        copy = executor.jobs[0][2][0]
+        executor.run()
+
+        self.assertEqual(set(pending["thumbnail"].result()), {"webp", "jpeg"})
+        self.assertFalse(os.path.exists(copy))
+
+    def test_failed_variants_are_logged(self) -> None:
+        """
+        Test a failed upload of the variants is logged, not swallowed
+        """
+        article = Article.objects.create(
+            title=fake.name(), description=fake.text(), body=fake.text()
+        )
+        pending = start_image_variants(sample_image())
+
+        with patch(
+            "cloudinary.uploader.upload", side_effect=OSError("offline")
+        ), self.assertLogs("app.images", "ERROR"):
+            store_image_variants(Article, article.pk, "stored", pending)
+
+        article.refresh_from_db()
+        self.assertEqual(article.image_variants, {})
+
+    def test_identical_upload_reuses_stored_image(self) -> None:
+        """
+        Test an upload matching a stored image skips rendering and upload
+        """
+        upload = sample_image()
+        variants = {"thumbnail": {"width": 150, "webp": fake.image_url()}}
+        Article.objects.create(
+            title=fake.name(),
+            description=fake.text(),
+            body=fake.text(),
+            image="image/upload/v1/stored.png",
+            image_digest=image_digest(upload),
+            image_variants=variants,
+        )
+        validated_data = {"image": upload}
+
+        self.assertIsNone(prepare_image(validated_data))
+        self.assertEqual(validated_data["image"].public_id, "stored")
+        self.assertEqual(validated_data["image_variants"], variants)
+
+    def test_image_without_variants_is_not_reused(self) -> None:
+        """
+        Test a stored image whose variants were never stored is rendered
+        again rather than copied
+        """
+        upload = sample_image()
+        Article.objects.create(
+            title=fake.name(),
+            description=fake.text(),
+            body=fake.text(),
+            image="image/upload/v1/stored.png",
+            image_digest=image_digest(upload),
+        )
+
+        self.assertIsNotNone(prepare_image({"image": upload}))
+
+    def test_new_upload_records_digest(self) -> None:
+        """
+        Test a new upload is hashed and queued for rendering
+        """
+        upload = sample_image()
+        validated_data = {"image": upload}
+
+        self.assertIsNotNone(prepare_image(validated_data))
+        self.assertEqual(validated_data["image_digest"], image_digest(upload))
@@ -0,0 +1,198 @@
+import gzip
+from unittest import skipUnless
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from app.articles.management.commands.benchmark_middleware import full_stack
+from app.middleware import CompressionMiddleware, accepted_encodings, brotli
+
+
+class TestCompressionMiddleware(TestCase):
+    """
+    Tests for the response compression middleware
+    """
+
+    content = b'{"body": "' + b"speaksfer " * 500 + b'"}'
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    def compress(self, response: HttpResponse, accept: str) -> HttpResponse:
+        request = self.factory.get("/api/", HTTP_ACCEPT_ENCODING=accept)
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request)
+
+    def test_accepted_encodings(self) -> None:
+        """
+        Test codings are mapped to their quality, 1 by default
+        """
+        self.assertEqual(
+            accepted_encodings("gzip;q=0.5, br;q=0, deflate, x;q=bad"),
+            {"gzip": 0.5, "br": 0.0, "deflate": 1.0},
+        )
+
+    def test_gzip_response(self) -> None:
+        """
+        Test large responses are gzipped when accepted
+        """
+        response = self.compress(
+            HttpResponse(self.content, content_type="application/json"),
+            "gzip",
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content), self.content)
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli_preferred(self) -> None:
+        """
+        Test brotli is chosen when the client accepts it
+        """
+        response = self.compress(
+            HttpResponse(self.content, content_type="application/json"),
+            "gzip, br",
+        )
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), self.content)
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_quality_values_ranked(self) -> None:
+        """
+        Test the coding the client ranks higher wins
+        """
+        for accept, expected in [
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0.8, *", "br"),
+            ("br;q=0, *;q=0.1", "gzip"),
+        ]:
+            response = self.compress(
+                HttpResponse(self.content, content_type="application/json"),
+                accept,
+            )
+
+            self.assertEqual(response["Content-Encoding"], expected)
+
+    def test_refused_codings_untouched(self) -> None:
+        """
+        Test nothing is compressed when every coding is refused
+        """
+        response = self.compress(
+            HttpResponse(self.content, content_type="application/json"),
+            "gzip;q=0, br;q=0",
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_non_api_response_untouched(self) -> None:
+        """
+        Test pages outside the API, such as the admin, are not compressed
+        """
+        request = self.factory.get("/admin/", HTTP_ACCEPT_ENCODING="gzip")
+        middleware = CompressionMiddleware(
+            lambda request: HttpResponse(self.content)
+        )
+
+        response = middleware(request)
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, self.content)
+
+    def test_small_response_untouched(self) -> None:
+        """
+        Test responses under the threshold are sent as they are
+        """
+        response = self.compress(
+            HttpResponse(b'{"ok": true}', content_type="application/json"),
+            "gzip",
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, b'{"ok": true}')
+
+    def test_compressed_type_untouched(self) -> None:
+        """
+        Test already compressed payloads are not compressed again
+        """
+        content = gzip.compress(self.content)
+        response = self.compress(
+            HttpResponse(content, content_type="application/gzip"), "gzip"
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming_response(self) -> None:
+        """
+        Test streaming responses are compressed chunk by chunk
+        """
+        chunks = [self.content[:100], self.content[100:]]
+        response = self.compress(StreamingHttpResponse(iter(chunks)), "gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)),
+            self.content,
+        )
+
+
+class TestApiExemptMiddleware(TestCase):
+    """
+    Tests for skipping session based middleware on API routes
+    """
+
+    def test_api_request_skips_session(self) -> None:
+        """
+        Test API requests carry no session, user or CSRF cookie
+        """
+        response = self.client.get(reverse("all-articles"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+        self.assertFalse(hasattr(response.wsgi_request, "_messages"))
+        self.assertNotIn("csrftoken", response.cookies)
+
+    def test_admin_keeps_full_stack(self) -> None:
+        """
+        Test the admin still gets sessions and CSRF protection
+        """
+        response = self.client.get(reverse("admin:login"))
+
+        self.assertTrue(hasattr(response.wsgi_request, "session"))
+        self.assertTrue(hasattr(response.wsgi_request, "user"))
+        self.assertIn("csrftoken", response.cookies)
+
+    def test_api_post_skips_csrf(self) -> None:
+        """
+        Test a POST under the API prefix is not checked for a CSRF token,
+        even by a view that is not marked exempt
+        """
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post(reverse("async-all-articles"))
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_admin_post_checks_csrf(self) -> None:
+        """
+        Test a POST outside the API prefix still needs a CSRF token
+        """
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post(reverse("admin:login"))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_full_stack(self) -> None:
+        """
+        Test the benchmark compares against the unmodified middleware
+        """
+        self.assertIn(
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            full_stack(),
+        )
+        self.assertNotIn(
+            "app.middleware.ApiExemptSessionMiddleware", full_stack()
+        )
@@ -0,0 +1,86 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from app.renderers import (
+    FastJSONParser,
+    FastJSONRenderer,
+    MessagePackRenderer,
+    msgpack,
+)
+
+
+class TestRenderers(TestCase):
+    """
+    Tests for the API renderers and parser
+    """
+
+    data = {
+        "post_id": uuid.uuid4(),
+        "created_at": datetime.datetime(2022, 8, 11, 7, 26, 1, 123456),
+        "rating": Decimal("4.5"),
+        "title": "line separator",
+        "tags": ["python", "django"],
+    }
+
+    def test_fast_json_matches_stdlib(self) -> None:
+        """
+        Test the fast renderer produces the same JSON as DRF's renderer
+        """
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data),
+        )
+
+    def test_fast_json_parser(self) -> None:
+        """
+        Test the fast parser reads what the renderer writes
+        """
+        stream = io.BytesIO(b'{"title": "python", "tags": [1, 2]}')
+
+        self.assertEqual(
+            FastJSONParser().parse(stream),
+            {"title": "python", "tags": [1, 2]},
+        )
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_msgpack_renderer(self) -> None:
+        """
+        Test MessagePack output decodes to the JSON representation
+        """
+        output = MessagePackRenderer().render(self.data)
+
+        decoded = msgpack.unpackb(output)
+        self.assertEqual(decoded["post_id"], str(self.data["post_id"]))
+        self.assertEqual(
+            decoded["created_at"], self.data["created_at"].isoformat()
+        )
+
+    def test_browsable_api_in_development(self) -> None:
+        """
+        Test the browsable API is still offered outside production
+        """
+        response = self.client.get(
+            reverse("all-articles"), HTTP_ACCEPT="text/html"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/html"))
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_msgpack_negotiation(self) -> None:
+        """
+        Test clients asking for MessagePack receive it
+        """
+        response = self.client.get(
+            reverse("all-articles"), HTTP_ACCEPT="application/msgpack"
+        )
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content)["count"], 0)
@@ -0,0 +1,133 @@
+import json
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from drf_yasg.renderers import OpenAPIRenderer
+
+from app import schema
+
+
+class TestCachedSchema(TestCase):
+    """
+    Tests for serving the schema rendered once per code version
+    """
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            SCHEMA_CACHE_DIR=Path(directory.name), CODE_VERSION="test"
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        schema.code_version.cache_clear()
+        self.addCleanup(schema.code_version.cache_clear)
+        schema._schemas.clear()
+        cache.clear()
+        self.url = reverse("schema-swagger-ui") + "?format=openapi"
+
+    def test_schema_rendered_once(self) -> None:
+        """
+        Test repeated requests do not introspect the views again
+        """
+        with patch(
+            "app.schema.render_schema", wraps=schema.render_schema
+        ) as render:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertIn(b'"swagger"', first.content)
+        self.assertEqual(render.call_count, 1)
+
+    def test_generate_schema_file_is_served(self) -> None:
+        """
+        Test the file written by the command is served as it is
+        """
+        call_command("generate_schema", stdout=StringIO())
+        path = schema.schema_path("json")
+        path.write_bytes(b'{"swagger": "2.0", "generated": true}')
+        schema._schemas.clear()
+
+        with patch("app.schema.render_schema") as render:
+            response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.content, b'{"swagger": "2.0", "generated": true}'
+        )
+        render.assert_not_called()
+
+    def test_version_changes_schema(self) -> None:
+        """
+        Test a new code version does not reuse the previous schema
+        """
+        schema.get_schema(OpenAPIRenderer())
+        with override_settings(CODE_VERSION="next"):
+            schema.code_version.cache_clear()
+            with patch(
+                "app.schema.render_schema", return_value=b"{}"
+            ) as render:
+                schema.get_schema(OpenAPIRenderer())
+
+        render.assert_called_once()
+
+
+class TestSchemaContent(TestCase):
+    """
+    Tests for what the schema documents
+    """
+
+    def test_payload_views_are_documented(self) -> None:
+        """
+        Test views building their own payload are documented by it
+        """
+        paths = json.loads(schema.render_schema(OpenAPIRenderer()))["paths"]
+        expected = {
+            "/articles/articles/trending/": "TrendingArticles",
+            "/articles/tags/popular/": "PopularTags",
+            "/articles/articles/front/": "FrontPage",
+            "/articles/articles/export/": "ArticleExport",
+            "/articles/authors/{user}/": "ProfilePage",
+        }
+
+        for path, definition in expected.items():
+            self.assertEqual(
+                paths[path]["get"]["responses"]["200"]["schema"],
+                {"$ref": f"#/definitions/{definition}"},
+            )
+
+
+class TestLazySchemaViews(TestCase):
+    """
+    Tests for deferring the schema views to their first request
+    """
+
+    def test_urls_do_not_import_drf_yasg_views(self) -> None:
+        """
+        Test loading the URL tree leaves drf_yasg and Pillow unimported
+        """
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, django; django.setup(); "
+                "from django.urls import get_resolver; "
+                "get_resolver().url_patterns; "
+                "print([name for name in ('drf_yasg', 'PIL') "
+                "if name in sys.modules])",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "[]")
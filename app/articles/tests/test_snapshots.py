@@ -0,0 +1,215 @@
+import json
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.articles import snapshots
+from app.articles.caches import (
+    FRONT_PAGE_KEY,
+    front_page_is_stale,
+    mark_front_page_stale,
+)
+from app.articles.models import Article, Tag
+from app.cache import lock_cache
+
+User = get_user_model()
+fake = Faker()
+
+
+class TestFrontPage(TransactionTestCase):
+    """
+    Tests for the front page snapshot. Changes mark it stale once they
+    are committed, so the data has to be committed.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.tag = Tag.objects.create(name=fake.word())
+        for _ in range(3):
+            article = Article.objects.create(
+                title=fake.sentence(),
+                description=fake.paragraph(nb_sentences=1),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+        article.tags.add(self.tag)
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("front-page")
+
+    def test_front_page_matches_all_articles(self) -> None:
+        """
+        Test the snapshot holds the first page of all articles and the
+        popular tags
+        """
+        response = self.client.get(self.url)
+        articles = self.client.get(reverse("all-articles")).json()
+
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(data["articles"], articles)
+        self.assertEqual(
+            data["tags"], [{"name": self.tag.name, "articles": 1}]
+        )
+
+    def test_front_page_is_a_cache_read(self) -> None:
+        """
+        Test a repeated anonymous request does not touch the database
+        """
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_stale_snapshot_is_revalidated(self) -> None:
+        """
+        Test an expired snapshot is served while a fresh one is built
+        """
+        cache.set(FRONT_PAGE_KEY, (time.time() - 1, b'{"stale": true}'), 60)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json(), {"stale": True})
+        fresh_until, content = cache.get(FRONT_PAGE_KEY)
+        self.assertGreater(fresh_until, time.time())
+        self.assertEqual(json.loads(content)["articles"]["count"], 3)
+
+    def test_publishing_rebuilds_snapshot(self) -> None:
+        """
+        Test a new article reaches the snapshot once a reader finds it
+        stale, without waiting for it to expire
+        """
+        self.client.get(self.url)
+
+        article = Article.objects.create(
+            title=fake.sentence(),
+            description=fake.paragraph(nb_sentences=1),
+            body=fake.paragraph(),
+            author=self.author,
+        )
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+
+        results = response.json()["articles"]["results"]
+        self.assertEqual(results[0]["slug"], article.slug)
+
+    def test_rebuild_is_left_to_lock_holder(self) -> None:
+        """
+        Test a change seen while another worker rebuilds the snapshot is
+        flagged for that worker
+        """
+        lock_cache().add(f"{FRONT_PAGE_KEY}:lock", "theirs")
+
+        snapshots.refresh_front_page()
+
+        self.assertIsNone(cache.get(FRONT_PAGE_KEY))
+        self.assertTrue(front_page_is_stale())
+
+    def test_flagged_rebuild_is_run_by_lock_holder(self) -> None:
+        """
+        Test the worker holding the lock rebuilds once more when another
+        worker flagged a change during its rebuild
+        """
+        calls = []
+
+        def regenerate() -> None:
+            calls.append(True)
+            if len(calls) == 1:
+                mark_front_page_stale()
+
+        with patch.object(snapshots, "regenerate_front_page", regenerate):
+            snapshots.refresh_front_page()
+
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(front_page_is_stale())
+
+    @override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "PAGE_SIZE": 2}
+    )
+    def test_only_listed_articles_mark_snapshot_stale(self) -> None:
+        """
+        Test editing an article the front page does not list leaves the
+        snapshot alone
+        """
+        self.client.get(self.url)
+        oldest, newest = Article.objects.order_by("created_at")[::2]
+
+        oldest.save()
+        self.assertFalse(front_page_is_stale())
+        newest.save()
+        self.assertTrue(front_page_is_stale())
+
+    @override_settings(BACKGROUND_REBUILDS=True)
+    def test_changes_do_not_start_rebuilds(self) -> None:
+        """
+        Test saving an article only marks the snapshot stale, leaving the
+        rebuild to the next reader
+        """
+        self.client.get(self.url)
+
+        with patch("app.articles.snapshots.threading.Thread") as thread:
+            Article.objects.create(
+                title=fake.sentence(),
+                description=fake.paragraph(nb_sentences=1),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+            thread.assert_not_called()
+            self.client.get(self.url)
+        self.addCleanup(snapshots._refreshing.release)
+
+        thread.assert_called_once()
+
+    def test_signed_in_reader_gets_own_flags(self) -> None:
+        """
+        Test the viewer's flags are overlaid on the shared snapshot
+        """
+        article = Article.objects.first()
+        article.favourite.add(self.author)
+        self.client.force_authenticate(self.author)
+
+        response = self.client.get(self.url)
+
+        results = response.json()["articles"]["results"]
+        self.assertTrue(results[0]["favourited"])
+        self.assertFalse(results[1]["favourited"])
+
+
+class TestFrontPageSignals(SimpleTestCase):
+    """
+    Tests for connecting the front page receivers without the snapshot
+    module
+    """
+
+    def test_setup_leaves_snapshots_unimported(self) -> None:
+        """
+        Test starting Django does not load the snapshot module and the
+        serializers it builds the front page with
+        """
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, django; django.setup(); "
+                "print([name for name in ('app.articles.snapshots', "
+                "'app.articles.serializers') if name in sys.modules])",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "[]")
@@ -0,0 +1,55 @@
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import ValidationError
+
+from app.uploads import ImageTooLarge, ImageUploadHandler
+
+from .mocks import sample_image
+
+
+class TestImageUploadHandler(TestCase):
+    """
+    Tests for the streaming image upload handler
+    """
+
+    def stream(self, data: bytes) -> ImageUploadHandler:
+        handler = ImageUploadHandler()
+        handler.new_file("image", "tests.png", "image/png", len(data))
+        for start in range(0, len(data), 16):
+            handler.receive_data_chunk(data[start : start + 16], start)
+        return handler
+
+    def test_stream_image_to_temporary_file(self) -> None:
+        """
+        Test a valid image is written to a temporary file
+        """
+        data = sample_image().read()
+        upload = self.stream(data).file_complete(len(data))
+
+        self.assertTrue(upload.temporary_file_path())
+        self.assertEqual(upload.size, len(data))
+
+    @override_settings(MAX_IMAGE_UPLOAD_SIZE=64)
+    def test_reject_oversized_image(self) -> None:
+        """
+        Test the upload stops once the size limit is passed
+        """
+        with self.assertRaises(ImageTooLarge):
+            self.stream(sample_image().read())
+
+    @override_settings(MAX_IMAGE_DIMENSION=10)
+    def test_reject_large_dimensions(self) -> None:
+        """
+        Test the image is rejected as soon as its header is read
+        """
+        with self.assertRaises(ValidationError):
+            self.stream(sample_image().read())
+
+    @override_settings(MAX_IMAGE_UPLOAD_SIZE=64)
+    def test_reject_oversized_request(self) -> None:
+        """
+        Test the whole request is refused from its content length
+        """
+        with self.assertRaises(ImageTooLarge):
+            ImageUploadHandler().handle_raw_input(
+                None, {}, 10 * 1024 * 1024, b""
+            )
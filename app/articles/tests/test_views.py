@@ -3,17 +3,23 @@ from typing import Any, Dict
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from faker import Faker
 from rest_framework import status
+from rest_framework.test import APITestCase
 
 from app.articles.models import (
     Article,
     ArticleBookmark,
     ArticleComment,
     ArticleHighlight,
+    ArticleRatings,
+    Tag,
 )
+from app.articles.pagination import decode_change_cursor
+from app.user.models import Profile, UserFollowing
 
 from .mocks import sample_image
 
@@ -70,10 +76,14 @@ class TestArticleViews(TestCase):
         token = json.loads(response.content).get("access")
         return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
 
+    @patch(
+        "cloudinary.uploader.upload",
+        return_value={"secure_url": fake.image_url()},
+    )
     @patch(
         "cloudinary.uploader.upload_resource", return_value=fake.image_url()
     )
-    def test_create_article(self, upload_resource: Any) -> None:
+    def test_create_article(self, upload_resource: Any, upload: Any) -> None:
         """
         Testing creation of articles
         """
@@ -671,3 +681,592 @@ class TestArticleStatsView(TestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(ArticleBookmark.objects.count(), count)
+
+
+class TestProfilePageView(APITestCase):
+    """
+    Tests for the aggregated author page
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.viewer = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        Profile.objects.create(user=self.author, bio=fake.sentence())
+        for _ in range(3):
+            Article.objects.create(
+                title=fake.sentence(),
+                description=fake.paragraph(nb_sentences=1),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+        UserFollowing.objects.create(
+            follower=self.viewer, followed=self.author
+        )
+        self.client.force_authenticate(self.viewer)
+        self.url = reverse("profile-page", kwargs={"user": self.author.id})
+
+    def test_profile_page(self) -> None:
+        """
+        Test the page is assembled from a fixed number of queries
+        """
+        with self.assertNumQueries(10):
+            response = self.client.get(self.url)
+
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(data["profile"]["username"], self.author.username)
+        self.assertEqual(data["followers_count"], 1)
+        self.assertEqual(data["following_count"], 0)
+        self.assertTrue(data["is_following"])
+        self.assertEqual(data["articles_count"], 3)
+        self.assertEqual(len(data["articles"]), 3)
+
+    def test_profile_page_is_cached(self) -> None:
+        """
+        Test a repeated request only loads the viewer's own state
+        """
+        self.client.get(self.url)
+
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+    def test_unfollow_invalidates_page(self) -> None:
+        """
+        Test the cached page reflects a change in following
+        """
+        self.client.get(self.url)
+        UserFollowing.objects.filter(follower=self.viewer).delete()
+
+        response = self.client.get(self.url)
+
+        self.assertFalse(response.json()["is_following"])
+        self.assertEqual(response.json()["followers_count"], 0)
+
+    def test_profile_page_viewer_state(self) -> None:
+        """
+        Test the viewer's flags are not shared through the cache
+        """
+        article = Article.objects.filter(author=self.author).first()
+        article.favourite.add(self.viewer)
+        self.client.get(self.url)
+
+        self.client.force_authenticate(self.author)
+        response = self.client.get(self.url)
+
+        for item in response.json()["articles"]:
+            self.assertFalse(item["favourited"])
+            self.assertFalse(item["following_author"])
+
+
+class TestViewerState(APITestCase):
+    """
+    Tests for the viewer's flags on article payloads
+    """
+
+    def setUp(self) -> None:
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.viewer = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.articles = [
+            Article.objects.create(
+                title=fake.sentence(),
+                description=fake.paragraph(nb_sentences=1),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+            for _ in range(3)
+        ]
+        self.client.force_authenticate(self.viewer)
+
+    def test_list_viewer_state(self) -> None:
+        """
+        Test the flags reflect the viewer's own activity
+        """
+        first, second, _ = self.articles
+        first.favourite.add(self.viewer)
+        second.unfavourite.add(self.viewer)
+        ArticleBookmark.objects.create(user=self.viewer, article=second)
+        ArticleRatings.objects.create(
+            article=first, rating=4, rated_by=self.viewer
+        )
+        UserFollowing.objects.create(
+            follower=self.viewer, followed=self.author
+        )
+
+        response = self.client.get(reverse("all-articles"))
+
+        items = {item["post_id"]: item for item in response.json()["results"]}
+        self.assertTrue(items[str(first.pk)]["favourited"])
+        self.assertEqual(items[str(first.pk)]["my_rating"], 4)
+        self.assertFalse(items[str(first.pk)]["bookmarked"])
+        self.assertTrue(items[str(second.pk)]["unfavourited"])
+        self.assertTrue(items[str(second.pk)]["bookmarked"])
+        self.assertIsNone(items[str(second.pk)]["my_rating"])
+        self.assertTrue(
+            all(item["following_author"] for item in items.values())
+        )
+
+    def test_list_viewer_state_is_batched(self) -> None:
+        """
+        Test the flags cost the same queries however long the page is
+        """
+        with self.assertNumQueries(9):
+            self.client.get(reverse("all-articles"))
+
+        for _ in range(3):
+            Article.objects.create(
+                title=fake.sentence(),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+
+        with self.assertNumQueries(9):
+            self.client.get(reverse("all-articles"))
+
+    def test_anonymous_viewer_state(self) -> None:
+        """
+        Test anonymous readers get empty flags without extra queries
+        """
+        self.client.force_authenticate(None)
+
+        response = self.client.get(reverse("all-articles"))
+
+        item = response.json()["results"][0]
+        self.assertFalse(item["favourited"])
+        self.assertIsNone(item["my_rating"])
+
+
+class TestArticleLibraryViews(APITestCase):
+    """
+    Tests for a reader's bookmarks and favourites
+    """
+
+    def setUp(self) -> None:
+        self.reader = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.articles = [
+            Article.objects.create(
+                title=fake.sentence(),
+                description=fake.paragraph(nb_sentences=1),
+                body=fake.paragraph(),
+                author=self.reader,
+            )
+            for _ in range(3)
+        ]
+        self.client.force_authenticate(self.reader)
+
+    def test_my_bookmarks(self) -> None:
+        """
+        Test only the reader's bookmarks are listed, newest first
+        """
+        other = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        for article in self.articles[:2]:
+            ArticleBookmark.objects.create(user=self.reader, article=article)
+        ArticleBookmark.objects.create(user=other, article=self.articles[2])
+
+        response = self.client.get(reverse("my-bookmarks"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["post_id"] for item in response.json()["results"]],
+            [str(self.articles[1].pk), str(self.articles[0].pk)],
+        )
+        self.assertTrue(
+            all(item["bookmarked"] for item in response.json()["results"])
+        )
+
+    def test_my_favourites(self) -> None:
+        """
+        Test favourites are listed newest first with a cursor
+        """
+        for article in self.articles:
+            article.favourite.add(self.reader)
+
+        response = self.client.get(reverse("my-favourites"))
+
+        self.assertEqual(
+            [item["post_id"] for item in response.json()["results"]],
+            [str(article.pk) for article in reversed(self.articles)],
+        )
+        self.assertIn("next", response.json())
+
+    def test_duplicate_bookmark(self) -> None:
+        """
+        Test bookmarking twice keeps a single bookmark
+        """
+        url = reverse(
+            "article-bookmark", kwargs={"article_id": self.articles[0].pk}
+        )
+        data = {"article": str(self.articles[0].pk)}
+
+        self.client.post(url, data)
+        self.client.post(url, data)
+
+        self.assertEqual(ArticleBookmark.objects.count(), 1)
+
+    def test_bookmark_import_export(self) -> None:
+        """
+        Test bookmarks round trip through the bulk endpoint
+        """
+        ArticleBookmark.objects.create(
+            user=self.reader, article=self.articles[0]
+        )
+        missing = str(fake.uuid4())
+        ids = [str(article.pk) for article in self.articles]
+
+        response = self.client.post(
+            reverse("bookmark-bulk"),
+            {"articles": ids + [missing]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["missing"], [missing])
+        self.assertEqual(ArticleBookmark.objects.count(), 3)
+
+        response = self.client.get(reverse("bookmark-bulk"))
+
+        self.assertEqual(response.json()["articles"], ids)
+
+
+@override_settings(ARTICLE_CHANGES_LAG=0)
+class TestArticleChangesView(APITestCase):
+    """
+    Tests for the article changes feed
+    """
+
+    def setUp(self) -> None:
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.articles = [
+            Article.objects.create(
+                title=fake.sentence(),
+                description=fake.paragraph(nb_sentences=1),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+            for _ in range(3)
+        ]
+        self.url = reverse("article-changes")
+
+    def test_changes_since_cursor(self) -> None:
+        """
+        Test only changed and deleted articles follow the cursor
+        """
+        cursor = self.client.get(self.url).json()["cursor"]
+        updated, deleted, _ = self.articles
+        updated.title = fake.sentence()
+        updated.save()
+        deleted_id = str(deleted.pk)
+        deleted.delete()
+
+        response = self.client.get(self.url, {"cursor": cursor})
+
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["post_id"] for item in data["articles"]], [str(updated.pk)]
+        )
+        self.assertEqual(data["deleted"], [deleted_id])
+        self.assertFalse(data["has_more"])
+
+    @override_settings(ARTICLE_CHANGES_PAGE_SIZE=2)
+    def test_changes_are_paged(self) -> None:
+        """
+        Test a full sync walks every article once
+        """
+        response = self.client.get(self.url)
+        first = response.json()
+        response = self.client.get(self.url, {"cursor": first["cursor"]})
+        second = response.json()
+
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        self.assertCountEqual(
+            [item["post_id"] for item in first["articles"]]
+            + [item["post_id"] for item in second["articles"]],
+            [str(article.pk) for article in self.articles],
+        )
+
+    @override_settings(ARTICLE_CHANGES_PAGE_SIZE=2)
+    def test_deletions_are_paged(self) -> None:
+        """
+        Test deletions share the page size and cursor with updates
+        """
+        cursor = self.client.get(self.url).json()["cursor"]
+        deleted_ids = set()
+        for article in self.articles:
+            deleted_ids.add(str(article.pk))
+            article.delete()
+
+        first = self.client.get(self.url, {"cursor": cursor}).json()
+        second = self.client.get(self.url, {"cursor": first["cursor"]}).json()
+
+        self.assertEqual(len(first["deleted"]), 2)
+        self.assertTrue(first["has_more"])
+        self.assertEqual(
+            set(first["deleted"] + second["deleted"]), deleted_ids
+        )
+        self.assertFalse(second["has_more"])
+
+    @override_settings(ARTICLE_CHANGES_LAG=60)
+    def test_recent_changes_are_held_back(self) -> None:
+        """
+        Test changes younger than the lag are left for a later sync
+        """
+        response = self.client.get(self.url)
+        data = response.json()
+
+        self.assertEqual(data["articles"], [])
+        since, _ = decode_change_cursor(data["cursor"])
+        self.assertLess(since, self.articles[0].updated_at)
+
+    def test_invalid_cursor(self) -> None:
+        """
+        Test a malformed cursor is rejected
+        """
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestArticleBatchView(APITestCase):
+    """
+    Tests for fetching many articles at once
+    """
+
+    def setUp(self) -> None:
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.articles = [
+            Article.objects.create(
+                title=fake.sentence(),
+                description=fake.paragraph(nb_sentences=1),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+            for _ in range(3)
+        ]
+        self.url = reverse("article-batch")
+
+    def test_batch_preserves_order(self) -> None:
+        """
+        Test articles come back in the requested order with missing ids
+        """
+        first, second, third = self.articles
+        ids = [third.slug, "missing-slug", str(first.pk), second.slug]
+
+        response = self.client.get(self.url, {"ids": ",".join(ids)})
+
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["post_id"] for item in data["articles"]],
+            [str(third.pk), str(first.pk), str(second.pk)],
+        )
+        self.assertEqual(data["missing"], ["missing-slug"])
+
+    @override_settings(ARTICLE_BATCH_LIMIT=2)
+    def test_batch_limit(self) -> None:
+        """
+        Test requests for too many articles are rejected
+        """
+        ids = ",".join(article.slug for article in self.articles)
+
+        response = self.client.get(self.url, {"ids": ids})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestArticleExportView(APITestCase):
+    """
+    Tests for the streaming article export
+    """
+
+    def setUp(self) -> None:
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        for _ in range(2):
+            Article.objects.create(
+                title=fake.sentence(),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+        self.url = reverse("article-export")
+
+    def test_export_requires_admin(self) -> None:
+        """
+        Test readers can not download the corpus
+        """
+        self.client.force_authenticate(self.author)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_streams_ndjson(self) -> None:
+        """
+        Test admins receive one JSON document per article
+        """
+        self.author.is_staff = True
+        self.author.save()
+        self.client.force_authenticate(self.author)
+
+        response = self.client.get(self.url)
+
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["author"], self.author.username)
+
+
+class TestCachedFeeds(APITestCase):
+    """
+    Tests for the article payloads, trending articles and tags served
+    from the cache
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.reader = User.objects.create_user(
+            username=fake.user_name(), email=fake.email(), password="pass"
+        )
+        self.tag = Tag.objects.create(name=fake.word())
+        self.articles = [
+            Article.objects.create(
+                title=fake.sentence(),
+                body=fake.paragraph(),
+                author=self.author,
+            )
+            for _ in range(3)
+        ]
+        self.articles[0].tags.add(self.tag)
+        self.client.force_authenticate(self.author)
+        self.url = reverse(
+            "article-detail", kwargs={"slug": self.articles[0].slug}
+        )
+
+    def test_article_detail_is_cached(self) -> None:
+        """
+        Test a repeated request only loads the viewer's own state
+        """
+        self.client.get(self.url)
+
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["tags"], [self.tag.name])
+
+    def test_favourite_invalidates_article(self) -> None:
+        """
+        Test the cached payload reflects a new favourite
+        """
+        self.client.get(self.url)
+        self.articles[0].favourite.add(self.reader)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["favourite_count"], 1)
+
+    def test_article_detail_owner_only(self) -> None:
+        """
+        Test the cached payload keeps the owner check
+        """
+        self.client.get(self.url)
+        self.client.force_authenticate(self.reader)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_orphaned_article(self) -> None:
+        """
+        Test an article whose author was deleted is still served, and is
+        owned by nobody
+        """
+        self.articles[0].favourite.add(self.reader)
+        self.author.delete()
+        self.client.force_authenticate(self.reader)
+
+        trending = self.client.get(reverse("trending-articles"))
+        detail = self.client.get(self.url)
+
+        articles = trending.json()["articles"]
+        self.assertEqual(trending.status_code, status.HTTP_200_OK)
+        self.assertIsNone(articles[0]["author"])
+        self.assertTrue(articles[0]["favourited"])
+        self.assertEqual(detail.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_missing_article(self) -> None:
+        """
+        Test an unknown slug is not found
+        """
+        url = reverse("article-detail", kwargs={"slug": "missing"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stats_are_cached(self) -> None:
+        """
+        Test statistics are served from the cache until a comment is added
+        """
+        url = reverse("statistics", kwargs={"slug": self.articles[0].slug})
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        ArticleComment.objects.create(
+            comment=fake.sentence(),
+            commenter=self.reader,
+            article=self.articles[0],
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.json()["results"][0]["comment_count"], 1)
+
+    def test_trending_articles(self) -> None:
+        """
+        Test trending articles are ordered by favourites with the viewer's
+        own flags
+        """
+        self.articles[2].favourite.add(self.reader)
+        self.client.force_authenticate(self.reader)
+
+        response = self.client.get(reverse("trending-articles"))
+
+        articles = response.json()["articles"]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(articles[0]["slug"], self.articles[2].slug)
+        self.assertTrue(articles[0]["favourited"])
+        self.assertFalse(articles[1]["favourited"])
+
+    def test_popular_tags(self) -> None:
+        """
+        Test only tags in use are listed with their article counts
+        """
+        Tag.objects.create(name=fake.word() + "-unused")
+
+        response = self.client.get(reverse("popular-tags"))
+
+        self.assertEqual(
+            response.json()["tags"], [{"name": self.tag.name, "articles": 1}]
+        )
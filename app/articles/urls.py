@@ -1,29 +1,68 @@
 from django.urls import path
 
+from app.articles.async_views import (
+    article_detail,
+    article_list,
+    article_stats,
+)
 from app.articles.views import (
+    ArticleBatchView,
     ArticleBookmarkView,
+    ArticleChangesView,
     ArticleCommentDetailView,
     ArticleCommentView,
     ArticleDetailView,
+    ArticleExportView,
     ArticleFavouriteView,
     ArticleListAllView,
     ArticleListView,
     ArticleRatingsListView,
     ArticleStatsView,
     ArticleUnFavouriteView,
+    BookmarkBulkView,
+    FrontPageView,
     HighlightArticleListView,
     HiglightDetailView,
+    MyBookmarksView,
+    MyFavouritesView,
+    PopularTagsView,
+    ProfilePageView,
+    TrendingArticlesView,
 )
 
 urlpatterns = [
     path("article/", ArticleListView.as_view(), name="article-list"),
     path("articles/", ArticleListAllView.as_view(), name="all-articles"),
+    path("articles/front/", FrontPageView.as_view(), name="front-page"),
+    path(
+        "articles/trending/",
+        TrendingArticlesView.as_view(),
+        name="trending-articles",
+    ),
+    path("tags/popular/", PopularTagsView.as_view(), name="popular-tags"),
+    path("articles/batch/", ArticleBatchView.as_view(), name="article-batch"),
+    path(
+        "articles/export/", ArticleExportView.as_view(), name="article-export"
+    ),
+    path(
+        "articles/changes/",
+        ArticleChangesView.as_view(),
+        name="article-changes",
+    ),
     path(
         "article/<slug:slug>/",
         ArticleDetailView.as_view(),
         name="article-detail",
     ),
+    path(
+        "authors/<uuid:user>/",
+        ProfilePageView.as_view(),
+        name="profile-page",
+    ),
     path("bookmarks/", ArticleBookmarkView.as_view(), name="bookmark"),
+    path("bookmarks/mine/", MyBookmarksView.as_view(), name="my-bookmarks"),
+    path("bookmarks/bulk/", BookmarkBulkView.as_view(), name="bookmark-bulk"),
+    path("favourites/mine/", MyFavouritesView.as_view(), name="my-favourites"),
     path(
         "articles/<str:article_id>/bookmarks/",
         ArticleBookmarkView.as_view(),
@@ -66,4 +105,15 @@ urlpatterns = [
         HiglightDetailView.as_view(),
         name="highlight-detail",
     ),
+    path("async/articles/", article_list, name="async-all-articles"),
+    path(
+        "async/article/<slug:slug>/",
+        article_detail,
+        name="async-article-detail",
+    ),
+    path(
+        "async/articles/<slug:slug>/stats/",
+        article_stats,
+        name="async-statistics",
+    ),
 ]
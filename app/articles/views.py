@@ -1,12 +1,27 @@
+import json
+import uuid
+from datetime import timedelta
 from typing import Any
 
+from django.conf import settings
+from django.db.models import OuterRef, Prefetch, Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.filters import SearchFilter
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.renderers import JSONRenderer
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from app.articles.caches import profile_page_key, profile_page_relationship
+from app.articles.export import export_articles, gzip_stream, ndjson_lines
+from app.articles.feeds import (
+    article_payload,
+    article_stats,
+    popular_tags,
+    trending_articles,
+)
 from app.articles.filters import ArticleFilter
 from app.articles.models import (
     Article,
@@ -14,23 +29,47 @@ from app.articles.models import (
     ArticleComment,
     ArticleHighlight,
     ArticleRatings,
+    ArticleTombstone,
+    subquery_count,
+)
+from app.articles.pagination import (
+    BookmarkPagination,
+    FavouritePagination,
+    changed_after,
+    decode_change_cursor,
+    encode_change_cursor,
 )
 from app.articles.permissions import IsOwnerOrReadOnly
 from app.articles.serializers import (
+    ArticleBatchSerializer,
     ArticleBookmarkSerializer,
     ArticleCommentSerializer,
+    ArticleExportSerializer,
     ArticleSerializer,
     ArticleStatSerializer,
+    BookmarkImportSerializer,
     FavouriteSerializer,
+    FrontPageSerializer,
+    PopularTagsSerializer,
+    ProfilePageSerializer,
     RatingSerializer,
     TextHighlightSerializer,
+    TrendingArticlesSerializer,
     UnFavouriteSerializer,
+    add_viewer_state,
+    payload_author_id,
 )
+from app.articles.snapshots import front_page
+from app.cache import get_or_compute
+from app.renderers import api_renderer_classes
+from app.uploads import ImageUploadMixin
+from app.user.models import Profile, UserFollowing
+from app.user.serializers import ProfileSerializer
 
 
-class ArticleListView(generics.ListCreateAPIView):
+class ArticleListView(ImageUploadMixin, generics.ListCreateAPIView):
     serializer_class = ArticleSerializer
-    queryset = Article.objects.all()
+    queryset = Article.objects.for_listing()
 
     permission_classes = [
         IsAuthenticated,
@@ -50,7 +89,7 @@ class ArticleListView(generics.ListCreateAPIView):
 
 class ArticleListAllView(generics.ListAPIView):
     serializer_class = ArticleSerializer
-    queryset = Article.objects.all()
+    queryset = Article.objects.for_listing()
     filter_backends = [SearchFilter]
     filterset_class = ArticleFilter
     search_fields = [
@@ -63,12 +102,212 @@ class ArticleListAllView(generics.ListAPIView):
     ]
 
 
-class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Article.objects.all()
+class TrendingArticlesView(generics.GenericAPIView):
+    """
+    The most favourited recent articles, cached for every viewer
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = TrendingArticlesSerializer
+    renderer_classes = api_renderer_classes()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(
+            {"articles": add_viewer_state(request.user, trending_articles())},
+            status=status.HTTP_200_OK,
+        )
+
+
+class PopularTagsView(generics.GenericAPIView):
+    """
+    The tags used by the most articles, with their article counts
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = PopularTagsSerializer
+    renderer_classes = api_renderer_classes()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response({"tags": popular_tags()}, status=status.HTTP_200_OK)
+
+
+class FrontPageView(generics.GenericAPIView):
+    """
+    The first page of all articles and the popular tags, sent from a
+    prerendered snapshot to anonymous readers. Signed in readers get
+    their own flags overlaid on it.
+    """
+
+    serializer_class = FrontPageSerializer
+    renderer_classes = api_renderer_classes()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        content = front_page()
+        if not request.user.is_authenticated:
+            return HttpResponse(content, content_type="application/json")
+        payload = json.loads(content)
+        payload["articles"]["results"] = add_viewer_state(
+            request.user, payload["articles"]["results"]
+        )
+        return Response(payload, status=status.HTTP_200_OK)
+
+
+class ArticleChangesView(generics.GenericAPIView):
+    """
+    Articles created or updated and articles deleted since the cursor, in
+    (timestamp, post_id) order. Changes younger than ARTICLE_CHANGES_LAG
+    seconds are held back so that a write committed after a later one is
+    not passed over by the cursor.
+    """
+
+    serializer_class = ArticleSerializer
+    renderer_classes = api_renderer_classes()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        horizon = timezone.now() - timedelta(
+            seconds=settings.ARTICLE_CHANGES_LAG
+        )
+        size = settings.ARTICLE_CHANGES_PAGE_SIZE
+        articles = Article.objects.for_listing().filter(
+            updated_at__lte=horizon
+        )
+        tombstones = ArticleTombstone.objects.filter(deleted_at__lte=horizon)
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            since, post_id = decode_change_cursor(cursor)
+            articles = articles.filter(
+                changed_after("updated_at", since, post_id)
+            )
+            tombstones = tombstones.filter(
+                changed_after("deleted_at", since, post_id)
+            )
+
+        changes = sorted(
+            [
+                (article.updated_at, article.post_id, article)
+                for article in articles.order_by("updated_at", "post_id")[
+                    : size + 1
+                ]
+            ]
+            + [
+                (deleted_at, post_id, None)
+                for deleted_at, post_id in tombstones.order_by(
+                    "deleted_at", "post_id"
+                ).values_list("deleted_at", "post_id")[: size + 1]
+            ],
+            key=lambda change: change[:2],
+        )
+        has_more = len(changes) > size
+        if has_more:
+            changes = changes[:size]
+            next_cursor = encode_change_cursor(*changes[-1][:2])
+        else:
+            next_cursor = encode_change_cursor(horizon)
+
+        return Response(
+            {
+                "articles": self.get_serializer(
+                    [article for _, _, article in changes if article],
+                    many=True,
+                ).data,
+                "deleted": [
+                    str(post_id)
+                    for _, post_id, article in changes
+                    if article is None
+                ],
+                "cursor": next_cursor,
+                "has_more": has_more,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ArticleBatchView(generics.GenericAPIView):
+    """
+    Fetch many articles by slug or post id in one request. Articles are
+    returned in the requested order and unknown ids are reported.
+    """
+
+    serializer_class = ArticleSerializer
+    renderer_classes = api_renderer_classes()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        batch = ArticleBatchSerializer(data=request.query_params)
+        batch.is_valid(raise_exception=True)
+        ids = batch.validated_data["ids"]
+
+        post_ids = []
+        for value in ids:
+            try:
+                post_ids.append(uuid.UUID(value))
+            except ValueError:
+                pass
+        articles = Article.objects.for_listing().filter(
+            Q(post_id__in=post_ids) | Q(slug__in=ids)
+        )
+        found = {}
+        for article in articles:
+            found[str(article.post_id)] = article
+            found[article.post_id.hex] = article
+            found[article.slug] = article
+
+        page = [found[value] for value in ids if value in found]
+        return Response(
+            {
+                "articles": self.get_serializer(page, many=True).data,
+                "missing": [value for value in ids if value not in found],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ArticleExportView(generics.GenericAPIView):
+    """
+    Stream the whole article corpus as newline delimited JSON, gzipped
+    when requested with ?gzip=1
+    """
+
+    permission_classes = [IsAdminUser]
+    serializer_class = ArticleExportSerializer
+
+    def get(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> StreamingHttpResponse:
+        stream = ndjson_lines(export_articles())
+        filename = "articles.ndjson"
+        content_type = "application/x-ndjson"
+        if request.query_params.get("gzip") in ("1", "true"):
+            stream = gzip_stream(stream)
+            filename += ".gz"
+            content_type = "application/gzip"
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ArticleDetailView(
+    ImageUploadMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    queryset = Article.objects.for_listing()
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     lookup_field = "slug"
 
+    def retrieve(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        """
+        Serve the shared cached payload with the viewer's flags overlaid
+        """
+        payload = article_payload(self.kwargs["slug"])
+        if payload is None:
+            raise Http404
+        self.check_object_permissions(
+            request, Article(author_id=payload_author_id(payload))
+        )
+        return Response(add_viewer_state(request.user, [payload])[0])
+
     def delete(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """
         Returns message on deletion of articles
@@ -95,17 +334,80 @@ class ArticleBookmarkView(generics.ListCreateAPIView):
         )
 
 
+class ArticleLibraryView(generics.ListAPIView):
+    """
+    Base view listing the articles a reader has saved, rendered as article
+    cards fetched in one batched query per page. `library_model` holds the
+    reader's entries, each linking a user to an article.
+    """
+
+    library_model: Any
+    serializer_class = ArticleSerializer
+    permission_classes = [IsAuthenticated]
+    renderer_classes = api_renderer_classes()
+
+    def get_queryset(self) -> Any:
+        entries = self.library_model.objects.filter(user=self.request.user)
+        return entries.prefetch_related(
+            Prefetch("article", queryset=Article.objects.for_listing())
+        )
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(
+            [entry.article for entry in page], many=True
+        )
+        return self.get_paginated_response(serializer.data)
+
+
+class MyBookmarksView(ArticleLibraryView):
+    library_model = ArticleBookmark
+    pagination_class = BookmarkPagination
+
+
+class MyFavouritesView(ArticleLibraryView):
+    library_model = Article.favourite.through
+    pagination_class = FavouritePagination
+
+
+class BookmarkBulkView(generics.GenericAPIView):
+    """
+    Export all of a reader's bookmarks or import many at once
+    """
+
+    serializer_class = BookmarkImportSerializer
+    permission_classes = [IsAuthenticated]
+    renderer_classes = api_renderer_classes()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        articles = (
+            ArticleBookmark.objects.filter(user=request.user)
+            .order_by("created_at")
+            .values_list("article_id", flat=True)
+        )
+        return Response(
+            {"articles": [str(article_id) for article_id in articles]},
+            status=status.HTTP_200_OK,
+        )
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class ArticleCommentView(generics.ListCreateAPIView):
     serializer_class = ArticleCommentSerializer
     queryset = ArticleComment.objects.all()
     permission_classes = [IsAuthenticated]
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
 
 
 class ArticleCommentDetailView(generics.RetrieveDestroyAPIView):
     serializer_class = ArticleCommentSerializer
     queryset = ArticleComment.objects.all()
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
     permission_classes = [IsAuthenticated]
     lookup_field = "id"
 
@@ -128,7 +430,7 @@ class ArticleRatingsListView(generics.ListCreateAPIView):
 
     serializer_class = RatingSerializer
     queryset = ArticleRatings.objects.all()
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
     lookup_field = "article_id"
 
     def get_queryset(self) -> Any:
@@ -144,7 +446,7 @@ class ArticleFavouriteView(generics.UpdateAPIView):
     serializer_class = FavouriteSerializer
     queryset = Article.objects.all()
     lookup_field = "slug"
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
 
 
 class ArticleUnFavouriteView(generics.UpdateAPIView):
@@ -152,21 +454,21 @@ class ArticleUnFavouriteView(generics.UpdateAPIView):
     serializer_class = UnFavouriteSerializer
     queryset = Article.objects.all()
     lookup_field = "slug"
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
 
 
 class HighlightArticleListView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = TextHighlightSerializer
     queryset = ArticleHighlight.objects.all()
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
 
 
 class HiglightDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = TextHighlightSerializer
     queryset = ArticleHighlight.objects.all()
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
     lookup_field = "id"
 
     def delete(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -183,9 +485,71 @@ class HiglightDetailView(generics.RetrieveUpdateDestroyAPIView):
 class ArticleStatsView(generics.ListAPIView):
     serializer_class = ArticleStatSerializer
     queryset = Article.objects.all()
-    renderer_classes = (JSONRenderer,)
+    renderer_classes = api_renderer_classes()
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     lookup_field = "slug"
 
     def get_queryset(self) -> Any:
         return super().get_queryset().filter(slug=self.kwargs.get("slug"))
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        page = self.paginate_queryset(article_stats(self.kwargs["slug"]))
+        return self.get_paginated_response(page)
+
+
+class ProfilePageView(generics.GenericAPIView):
+    """
+    Everything needed to render an author's page in one response: the
+    profile, follow counts, whether the viewer follows the author and the
+    first page of their articles. Cached per author and relationship.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = ProfilePageSerializer
+    renderer_classes = api_renderer_classes()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        author_id = self.kwargs.get("user")
+        relationship = profile_page_relationship(request.user, author_id)
+        key = profile_page_key(author_id, relationship)
+        payload = get_or_compute(
+            key,
+            lambda: self.build_page(author_id, relationship),
+            settings.PROFILE_PAGE_CACHE_TIMEOUT,
+        )
+        articles = add_viewer_state(request.user, payload["articles"])
+        return Response(
+            {**payload, "articles": articles}, status=status.HTTP_200_OK
+        )
+
+    def build_page(self, author_id: Any, relationship: str) -> Any:
+        profile = get_object_or_404(
+            Profile.objects.select_related("user").annotate(
+                followers_count=subquery_count(
+                    UserFollowing.objects.filter(followed=OuterRef("user")),
+                    "followed",
+                ),
+                following_count=subquery_count(
+                    UserFollowing.objects.filter(follower=OuterRef("user")),
+                    "follower",
+                ),
+                articles_count=subquery_count(
+                    Article.objects.filter(author=OuterRef("user")), "author"
+                ),
+            ),
+            user_id=author_id,
+        )
+        articles = Article.objects.for_listing().filter(author_id=author_id)[
+            : settings.REST_FRAMEWORK["PAGE_SIZE"]
+        ]
+        context = {**self.get_serializer_context(), "viewer_state": False}
+        return {
+            "profile": ProfileSerializer(profile, context=context).data,
+            "followers_count": profile.followers_count,
+            "following_count": profile.following_count,
+            "is_following": relationship == "following",
+            "articles_count": profile.articles_count,
+            "articles": ArticleSerializer(
+                articles, many=True, context=context
+            ).data,
+        }
@@ -0,0 +1,66 @@
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from app.renderers import api_renderer_classes
+
+
+def async_read_view(
+    authenticated: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Awaitable[HttpResponse]]]:
+    """
+    Turn a synchronous read handler into an async Django view.
+
+    The handler receives a DRF request and returns the response data. It
+    is served by a read-only APIView, so authentication, permissions,
+    throttling, content negotiation and exception handling are those of
+    the other API views. Django 4.0 has no async ORM, so the view runs in
+    a worker thread with sync_to_async. It is not thread sensitive, which
+    lets concurrent requests query the database side by side instead of
+    queueing on one thread. As the request signals fire on another
+    thread, the worker closes its own expired connections around each
+    request.
+    """
+
+    def decorator(
+        handler: Callable[..., Any]
+    ) -> Callable[..., Awaitable[HttpResponse]]:
+        class HandlerView(APIView):
+            http_method_names = ["get", "head", "options"]
+            renderer_classes = api_renderer_classes()
+            permission_classes = (
+                [IsAuthenticated]
+                if authenticated
+                else api_settings.DEFAULT_PERMISSION_CLASSES
+            )
+
+            def get(self, request: Request, **kwargs: Any) -> Response:
+                return Response(handler(request, **kwargs))
+
+        drf_view = HandlerView.as_view()
+
+        def run(request: HttpRequest, kwargs: Any) -> Any:
+            close_old_connections()
+            try:
+                response = drf_view(request, **kwargs)
+                return response.render()
+            finally:
+                close_old_connections()
+
+        @wraps(handler)
+        async def view(request: HttpRequest, **kwargs: Any) -> HttpResponse:
+            return await sync_to_async(run, thread_sensitive=False)(
+                request, kwargs
+            )
+
+        return view
+
+    return decorator
@@ -0,0 +1,323 @@
+import pickle
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# The in-process tier is shared by the threads of a worker, like the
+# stores of LocMemCache, while the cache handler hands every thread its
+# own backend instance
+_stores: Dict[str, "OrderedDict[str, Tuple[float, bytes]]"] = {}
+_locks: Dict[str, threading.Lock] = {}
+_counters: Dict[str, Counter] = {}
+
+_missing = object()
+
+
+class TieredCache(BaseCache):
+    """
+    A size-bounded in-process LRU in front of a shared cache. Reads are
+    answered from process memory for at most LOCAL_TIMEOUT seconds, so an
+    invalidation made by another worker is seen within that time, while
+    writes and deletes go to both tiers. LOCATION names the shared cache.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location: str, params: Dict[str, Any]) -> None:
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = location
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        self.local_max_entries = options.get("LOCAL_MAX_ENTRIES", 1000)
+        self._store = _stores.setdefault(location, OrderedDict())
+        self._lock = _locks.setdefault(location, threading.Lock())
+        self._counters = _counters.setdefault(location, Counter())
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.shared_alias]
+
+    def get(
+        self, key: str, default: Any = None, version: Optional[int] = None
+    ) -> Any:
+        local_key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            entry = self._store.get(local_key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._store.move_to_end(local_key)
+                self._counters["local_hits"] += 1
+                return pickle.loads(entry[1])
+        value = self.shared.get(key, _missing, version=version)
+        if value is _missing:
+            self._count("misses")
+            return default
+        self._count("shared_hits")
+        self._set_local(local_key, value, self.local_timeout)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        self.shared.set(key, value, timeout, version=version)
+        self._set_local(
+            self.make_and_validate_key(key, version=version), value, timeout
+        )
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        """
+        Add in the shared tier only, as add is used to coordinate workers
+        """
+        self._delete_local([self.make_and_validate_key(key, version=version)])
+        return self.shared.add(key, value, timeout, version=version)
+
+    def touch(
+        self,
+        key: str,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        self._delete_local([self.make_and_validate_key(key, version=version)])
+        return self.shared.delete(key, version=version)
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        return self.get(key, _missing, version=version) is not _missing
+
+    def incr(
+        self, key: str, delta: int = 1, version: Optional[int] = None
+    ) -> int:
+        self._delete_local([self.make_and_validate_key(key, version=version)])
+        return self.shared.incr(key, delta, version=version)
+
+    def set_many(
+        self,
+        data: Dict[str, Any],
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> List[str]:
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self._set_local(
+                    self.make_and_validate_key(key, version=version),
+                    value,
+                    timeout,
+                )
+        return failed
+
+    def delete_many(
+        self, keys: Iterable[str], version: Optional[int] = None
+    ) -> None:
+        keys = list(keys)
+        self._delete_local(
+            [self.make_and_validate_key(key, version=version) for key in keys]
+        )
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+        self.shared.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Hits and misses of this worker since it started
+        """
+        with self._lock:
+            return {
+                "local_hits": self._counters["local_hits"],
+                "shared_hits": self._counters["shared_hits"],
+                "misses": self._counters["misses"],
+                "local_entries": len(self._store),
+            }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _set_local(self, local_key: str, value: Any, timeout: Any) -> None:
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is not None and timeout <= time.time():
+            self._delete_local([local_key])
+            return
+        expires = time.monotonic() + self.local_timeout
+        if timeout is not None:
+            expires = min(expires, time.monotonic() + timeout - time.time())
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        with self._lock:
+            self._store[local_key] = (expires, pickled)
+            self._store.move_to_end(local_key)
+            while len(self._store) > self.local_max_entries:
+                self._store.popitem(last=False)
+
+    def _delete_local(self, local_keys: List[str]) -> None:
+        with self._lock:
+            for local_key in local_keys:
+                self._store.pop(local_key, None)
+
+
+def is_process_local(backend: BaseCache) -> bool:
+    """
+    Whether values stored in the cache are only seen by this process
+    """
+    if isinstance(backend, TieredCache):
+        backend = backend.shared
+    return isinstance(backend, (LocMemCache, DummyCache))
+
+
+def lock_cache() -> BaseCache:
+    """
+    The cache holding the locks of the workers, read past the in-process
+    tier so a released lock is seen at once
+    """
+    backend = caches["default"]
+    if isinstance(backend, TieredCache):
+        return backend.shared
+    return backend
+
+
+def acquire_lock(lock_key: str) -> Optional[str]:
+    """
+    Take a lock shared by the workers, returning the token that releases
+    it or None when another caller holds it
+    """
+    token = uuid.uuid4().hex
+    if lock_cache().add(lock_key, token, settings.SINGLE_FLIGHT_LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def release_lock(lock_key: str, token: str) -> None:
+    """
+    Release a lock unless it expired and was taken by another caller
+    """
+    locks = lock_cache()
+    if locks.get(lock_key) == token:
+        locks.delete(lock_key)
+
+
+def is_locked(lock_key: str) -> bool:
+    return lock_cache().get(lock_key) is not None
+
+
+class Flight:
+    """
+    A computation in progress in this worker that other threads wait on
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+_flights: Dict[str, Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def store_computed(key: str, value: Any, timeout: int) -> None:
+    """
+    Cache a computed value, kept past its timeout so it can be served
+    stale while it is recomputed
+    """
+    cache.set(
+        key,
+        (time.time() + timeout, value),
+        timeout + settings.SINGLE_FLIGHT_STALE_TIMEOUT,
+    )
+
+
+def get_or_compute(key: str, build: Callable[[], Any], timeout: int) -> Any:
+    """
+    Return the cached value of an expensive computation, letting a single
+    caller rebuild it on a miss. Threads of the same worker wait for that
+    result and other workers wait for it to reach the cache. Once a value
+    is only stale, the others are given the stale value meanwhile. Builders
+    return None for missing objects, which are never cached.
+    """
+    entry = cache.get(key)
+    stale = None
+    if entry is not None:
+        fresh_until, stale = entry
+        if fresh_until > time.time():
+            return stale
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _flights[key] = Flight()
+    if not leader:
+        if stale is not None:
+            return stale
+        flight.done.wait(settings.SINGLE_FLIGHT_WAIT)
+        if flight.error is not None:
+            raise flight.error
+        if flight.done.is_set():
+            return flight.value
+        return build()
+
+    try:
+        flight.value = compute(key, build, timeout, stale)
+    except BaseException as error:
+        flight.error = error
+        raise
+    finally:
+        flight.done.set()
+        with _flights_lock:
+            _flights.pop(key, None)
+    return flight.value
+
+
+def compute(
+    key: str, build: Callable[[], Any], timeout: int, stale: Any
+) -> Any:
+    """
+    Rebuild the value under a lock shared by the workers. A worker that
+    does not get the lock serves the stale value or waits for the holder
+    to cache a fresh one.
+    """
+    lock_key = f"{key}:lock"
+    token = acquire_lock(lock_key)
+    if token is None:
+        if stale is not None:
+            return stale
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+            locked = is_locked(lock_key)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[1]
+            if not locked:
+                # The holder is done without caching a value, as for a
+                # missing object
+                break
+        return build()
+    try:
+        value = build()
+        if value is not None:
+            store_computed(key, value, timeout)
+        return value
+    finally:
+        release_lock(lock_key, token)
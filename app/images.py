@@ -0,0 +1,257 @@
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Union
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+
+IMAGE_MODELS = ("articles.Article", "user.Profile")
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_uploads: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Lazily start the process pool used to render image variants
+    """
+    global _executor
+    workers = settings.IMAGE_VARIANT_WORKERS
+    if workers <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def get_upload_executor() -> Optional[ThreadPoolExecutor]:
+    """
+    Lazily start the threads that upload rendered variants
+    """
+    global _uploads
+    workers = settings.IMAGE_UPLOAD_WORKERS
+    if workers <= 0:
+        return None
+    if _uploads is None:
+        _uploads = ThreadPoolExecutor(max_workers=workers)
+    return _uploads
+
+
+def render_variant(source: Union[str, bytes], width: int) -> Dict[str, bytes]:
+    """
+    Resize the image to the given width and encode it in every format.
+    The source is either the path of a streamed upload or the raw bytes.
+    """
+    from PIL import Image
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)  # type: ignore[assignment]
+    with Image.open(source) as image:
+        image.thumbnail((width, width * 4))
+        rgb = image.convert("RGB")
+    variants = {}
+    for fmt in settings.IMAGE_VARIANT_FORMATS:
+        output = io.BytesIO()
+        rgb.save(output, fmt, quality=80, optimize=True)
+        variants[fmt] = output.getvalue()
+    return variants
+
+
+def copy_upload(upload: Any) -> str:
+    """
+    Copy a streamed upload for render jobs that may outlive the request,
+    as Django deletes the upload's own file when the request ends
+    """
+    handle, path = tempfile.mkstemp(suffix=os.path.splitext(upload.name)[1])
+    with os.fdopen(handle, "wb") as copy:
+        with open(upload.temporary_file_path(), "rb") as source:
+            shutil.copyfileobj(source, copy)
+    return path
+
+
+def remove_when_done(path: str, futures: Iterable[Future]) -> None:
+    """
+    Delete a file once every job reading it has finished
+    """
+    futures = list(futures)
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(future: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+def start_image_variants(upload: Any) -> Optional[Dict[str, Future]]:
+    """
+    Queue the variants of an uploaded image for rendering so that the
+    work overlaps with the upload of the original
+    """
+    if upload is None or not hasattr(upload, "read"):
+        return None
+    executor = get_executor()
+    copy = None
+    if not hasattr(upload, "temporary_file_path"):
+        upload.seek(0)
+        source = upload.read()
+        upload.seek(0)
+    elif executor is None:
+        source = upload.temporary_file_path()
+    else:
+        source = copy = copy_upload(upload)
+    pending: Dict[str, Future] = {}
+    for name, width in settings.IMAGE_VARIANT_WIDTHS.items():
+        if executor is None:
+            future: Future = Future()
+            future.set_result(render_variant(source, width))
+        else:
+            future = executor.submit(render_variant, source, width)
+        pending[name] = future
+    if copy is not None:
+        remove_when_done(copy, pending.values())
+    return pending
+
+
+def image_digest(upload: Any) -> str:
+    """
+    Hash the uploaded image chunk by chunk without buffering it whole
+    """
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()
+
+
+def find_stored_image(digest: str) -> Optional[Any]:
+    """
+    Look up a previously stored image with the same content
+    """
+    for label in IMAGE_MODELS:
+        model = apps.get_model(label)
+        instance = (
+            model.objects.filter(image_digest=digest)
+            .exclude(image="")
+            .exclude(image_variants={})
+            .only("image", "image_variants")
+            .first()
+        )
+        if instance is not None:
+            return instance
+    return None
+
+
+def prepare_image(validated_data: Any) -> Optional[Dict[str, Future]]:
+    """
+    Reuse an identical stored image when there is one, otherwise start
+    rendering the variants of the new upload
+    """
+    upload = validated_data.get("image")
+    if upload is None or not hasattr(upload, "chunks"):
+        return None
+    digest = image_digest(upload)
+    validated_data["image_digest"] = digest
+    stored = find_stored_image(digest)
+    if stored is not None:
+        validated_data["image"] = stored.image
+        validated_data["image_variants"] = stored.image_variants
+        return None
+    return start_image_variants(upload)
+
+
+def save_image_variants(
+    instance: Any, pending: Optional[Dict[str, Future]]
+) -> None:
+    """
+    Upload the rendered variants off the request thread once the instance
+    is committed
+    """
+    if not pending:
+        return
+    public_id = getattr(instance.image, "public_id", None) or str(instance.pk)
+    args = (type(instance), instance.pk, public_id, pending)
+
+    def schedule() -> None:
+        executor = get_upload_executor()
+        if executor is None:
+            store_image_variants(*args)
+        else:
+            executor.submit(store_image_variants, *args)
+
+    transaction.on_commit(schedule)
+
+
+def store_image_variants(
+    model: Any, pk: Any, public_id: str, pending: Dict[str, Future]
+) -> None:
+    """
+    Upload every format of every width next to the original image and
+    record their urls on the instance
+    """
+    from cloudinary import uploader
+
+    try:
+        variants: Dict[str, Dict[str, Any]] = {}
+        for name, future in pending.items():
+            width = settings.IMAGE_VARIANT_WIDTHS[name]
+            variants[name] = {"width": width}
+            for fmt, data in future.result().items():
+                result = uploader.upload(
+                    io.BytesIO(data),
+                    public_id=f"{public_id}_{name}_{fmt}",
+                    format=fmt,
+                    overwrite=True,
+                )
+                variants[name][fmt] = result.get("secure_url")
+        instance = model.objects.filter(pk=pk).first()
+        if instance is None:
+            return
+        instance.image_variants = variants
+        fields = ["image_variants"]
+        if hasattr(instance, "updated_at"):
+            fields.append("updated_at")
+        instance.save(update_fields=fields)
+    except Exception:
+        # Nothing reads the result of the upload threads, so a failure
+        # would otherwise go unnoticed
+        logger.exception(
+            "Could not store the image variants of %s %s", model.__name__, pk
+        )
+    finally:
+        if get_upload_executor() is not None:
+            connections.close_all()
+
+
+def build_srcset(variants: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Turn stored variants into srcset strings keyed by format
+    """
+    srcset: Dict[str, str] = {}
+    if not variants:
+        return srcset
+    ordered = sorted(variants.values(), key=lambda item: item["width"])
+    for fmt in settings.IMAGE_VARIANT_FORMATS:
+        srcset[fmt] = ", ".join(
+            f"{item[fmt]} {item['width']}w"
+            for item in ordered
+            if item.get(fmt)
+        )
+    return srcset
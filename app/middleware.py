@@ -0,0 +1,174 @@
+import gzip
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """
+    The content codings of an Accept-Encoding header mapped to their
+    quality, where 0 refuses a coding
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip().partition("q=")[2]
+        try:
+            value = float(quality) if quality else 1.0
+        except ValueError:
+            continue
+        if coding:
+            accepted[coding.strip().lower()] = value
+    return accepted
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(
+        settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def brotli_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress API responses with brotli, when it is installed, or gzip,
+    whichever the client ranks higher. Only the routes under the API
+    prefix are compressed: they carry no CSRF token or session secret
+    next to reflected input, which compressed pages would leak to a
+    BREACH attack. Small, already encoded and already compressed
+    responses are left alone; streaming responses are compressed chunk
+    by chunk.
+    """
+
+    def choose_encoding(self, request: Any) -> Optional[str]:
+        accepted = accepted_encodings(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        available = ["br", "gzip"] if brotli is not None else ["gzip"]
+        quality = {
+            coding: accepted.get(coding, accepted.get("*", 0))
+            for coding in available
+        }
+        encoding = max(available, key=lambda coding: quality[coding])
+        return encoding if quality[encoding] > 0 else None
+
+    def process_response(self, request: Any, response: Any) -> Any:
+        if not request.path_info.startswith(settings.API_PATH_PREFIX):
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "")
+        if content_type.startswith(settings.COMPRESSION_EXCLUDED_TYPES):
+            return response
+        if not response.streaming and (
+            len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            compress = brotli_chunks if encoding == "br" else gzip_chunks
+            response.streaming_content = compress(response.streaming_content)
+            del response["Content-Length"]
+        else:
+            if encoding == "br":
+                content = brotli.compress(
+                    response.content,
+                    quality=settings.COMPRESSION_BROTLI_QUALITY,
+                )
+            else:
+                content = gzip.compress(
+                    response.content,
+                    compresslevel=settings.COMPRESSION_GZIP_LEVEL,
+                    mtime=0,
+                )
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+
+class ApiExemptMixin:
+    """
+    Skip the middleware on the API routes. They authenticate with JWT
+    only, so sessions, CSRF tokens, messages and the session user are
+    never used there. The hooks are skipped one by one, as the handler
+    calls process_view itself and the async path does not go through
+    __call__. Hooks the wrapped middleware lacks stay no-ops.
+    """
+
+    def is_exempt(self, request: Any) -> bool:
+        return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+    def process_request(self, request: Any) -> Any:
+        hook = getattr(super(), "process_request", None)
+        if hook is None or self.is_exempt(request):
+            return None
+        return hook(request)
+
+    def process_view(
+        self, request: Any, view: Any, args: Any, kwargs: Any
+    ) -> Any:
+        hook = getattr(super(), "process_view", None)
+        if hook is None or self.is_exempt(request):
+            return None
+        return hook(request, view, args, kwargs)
+
+    def process_response(self, request: Any, response: Any) -> Any:
+        hook = getattr(super(), "process_response", None)
+        if hook is None or self.is_exempt(request):
+            return response
+        return hook(request, response)
+
+
+class ApiExemptSessionMiddleware(ApiExemptMixin, SessionMiddleware):
+    pass
+
+
+class ApiExemptCsrfViewMiddleware(ApiExemptMixin, CsrfViewMiddleware):
+    pass
+
+
+class ApiExemptAuthenticationMiddleware(
+    ApiExemptMixin, AuthenticationMiddleware
+):
+    pass
+
+
+class ApiExemptMessageMiddleware(ApiExemptMixin, MessageMiddleware):
+    pass
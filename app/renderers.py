@@ -0,0 +1,97 @@
+from typing import Any, List, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Renders JSON with orjson when it is installed. Datetimes are passed
+    back to DRF's encoder so they are formatted exactly as before; UUIDs
+    are encoded natively. Falls back to the stdlib renderer otherwise.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Any = None,
+    ) -> bytes:
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=option
+        )
+        # Escape the separators that are valid JSON but not valid
+        # javascript, as the stdlib renderer does
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    Parses JSON with orjson when it is installed
+    """
+
+    def parse(
+        self,
+        stream: Any,
+        media_type: Optional[str] = None,
+        parser_context: Any = None,
+    ) -> Any:
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Renders MessagePack for clients that ask for application/msgpack.
+    Values msgpack can not encode are converted like DRF's JSON encoder.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Any = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=encoders.JSONEncoder().default, use_bin_type=True
+        )
+
+
+def api_renderer_classes() -> List[Any]:
+    """
+    The renderers of the API without the browsable API
+    """
+    return [import_string(path) for path in settings.API_RENDERER_CLASSES]
@@ -0,0 +1,121 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from drf_yasg import openapi
+from drf_yasg.inspectors import SwaggerAutoSchema
+from drf_yasg.views import SPEC_RENDERERS, get_schema_view
+from rest_framework import permissions
+from rest_framework.generics import GenericAPIView
+from rest_framework.mixins import ListModelMixin
+from rest_framework.viewsets import ViewSetMixin
+
+SCHEMA_INFO = openapi.Info(
+    title="Speaksfer API",
+    default_version="v1",
+    description="Documentation for Speaksfer API to enable tracking of the backend in building the application",
+    license=openapi.License(name="BSD License"),
+)
+
+
+class PayloadAutoSchema(SwaggerAutoSchema):
+    """
+    Documents the GET of a plain generic view as the one payload its
+    serializer describes. drf_yasg takes any view without a path
+    parameter for a paginated list, while these views build their own
+    response instead of listing a queryset.
+    """
+
+    def is_list_view(self) -> bool:
+        view = self.view
+        if isinstance(view, GenericAPIView) and not isinstance(
+            view, (ListModelMixin, ViewSetMixin)
+        ):
+            return False
+        return super().is_list_view()
+
+
+SCHEMA_EXTENSIONS = {"openapi": "json", ".json": "json", ".yaml": "yaml"}
+
+SchemaView = get_schema_view(
+    SCHEMA_INFO,
+    public=True,
+    permission_classes=[permissions.AllowAny],
+)
+
+_schemas: Dict[str, bytes] = {}
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """
+    The deployed code version, or a fingerprint of the source files when
+    none is configured
+    """
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    digest = hashlib.sha1()
+    root = settings.BASE_DIR.parent
+    for package in ("app", "speaksfer"):
+        for path in sorted((root / package).rglob("*.py")):
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    return digest.hexdigest()[:12]
+
+
+def schema_path(extension: str) -> Path:
+    return settings.SCHEMA_CACHE_DIR / f"openapi-{code_version()}.{extension}"
+
+
+def render_schema(renderer: Any) -> bytes:
+    """
+    Introspect every view and serializer and render the public schema
+    """
+    generator = SchemaView.generator_class(SCHEMA_INFO, "", None, None, None)
+    return renderer.render(generator.get_schema(request=None, public=True))
+
+
+def schema_key(extension: str) -> str:
+    return f"openapi:{code_version()}:{extension}"
+
+
+def get_schema(renderer: Any) -> bytes:
+    """
+    The rendered schema of the current code version, read from the file
+    written by generate_schema or the shared cache before it is rendered
+    """
+    extension = SCHEMA_EXTENSIONS[renderer.format]
+    key = schema_key(extension)
+    content = _schemas.get(key)
+    if content is not None:
+        return content
+    path = schema_path(extension)
+    if path.exists():
+        content = path.read_bytes()
+    else:
+        content = cache.get(key)
+        if content is None:
+            content = render_schema(renderer)
+            cache.set(key, content, None)
+    _schemas[key] = content
+    return content
+
+
+class CachedSchemaView(SchemaView):  # type: ignore[valid-type, misc]
+    """
+    Serves the schema rendered once per code version. The UI pages are
+    cheap and are rendered as usual.
+    """
+
+    def get(self, request: Any, version: str = "", format: Any = None) -> Any:
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, SPEC_RENDERERS):
+            return super().get(request, version, format)
+        return HttpResponse(
+            get_schema(renderer),
+            content_type=f"{renderer.media_type}; charset=utf-8",
+        )
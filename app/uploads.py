@@ -0,0 +1,92 @@
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from rest_framework import exceptions, status
+
+HEADER_LIMIT = 64 * 1024
+
+
+class ImageTooLarge(exceptions.APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "The uploaded image is too large."
+    default_code = "image_too_large"
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams uploaded images to a temporary file, checking the size and
+    dimensions as the chunks arrive so oversized uploads are rejected
+    before the rest of the body is read
+    """
+
+    def handle_raw_input(
+        self,
+        input_data: Any,
+        META: Any,
+        content_length: int,
+        boundary: Any,
+        encoding: Optional[str] = None,
+    ) -> None:
+        limit = (
+            settings.MAX_IMAGE_UPLOAD_SIZE
+            + settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        )
+        if content_length > limit:
+            raise ImageTooLarge()
+
+    def new_file(self, *args: Any, **kwargs: Any) -> None:
+        from PIL import ImageFile
+
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.parser: Optional[Any] = ImageFile.Parser()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        self.received += len(raw_data)
+        if self.received > settings.MAX_IMAGE_UPLOAD_SIZE:
+            raise ImageTooLarge()
+        if self.parser is not None:
+            self.check_header(raw_data)
+        super().receive_data_chunk(raw_data, start)
+
+    def check_header(self, raw_data: bytes) -> None:
+        """
+        Feed the leading bytes to Pillow until the image size is known
+        """
+        try:
+            self.parser.feed(raw_data)  # type: ignore[union-attr]
+            image = self.parser.image  # type: ignore[union-attr]
+        except Exception:
+            image = None
+        if image is None:
+            if self.received > HEADER_LIMIT:
+                raise exceptions.ValidationError(
+                    {"image": ["Upload a valid image."]}, code="invalid_image"
+                )
+            return
+        self.parser = None
+        if max(image.size) > settings.MAX_IMAGE_DIMENSION:
+            raise exceptions.ValidationError(
+                {
+                    "image": [
+                        "Image dimensions can not exceed "
+                        f"{settings.MAX_IMAGE_DIMENSION} pixels."
+                    ]
+                },
+                code="invalid_dimensions",
+            )
+
+
+class ImageUploadMixin:
+    """
+    Use the streaming image upload handler for the view's requests
+    """
+
+    def initialize_request(
+        self, request: Any, *args: Any, **kwargs: Any
+    ) -> Any:
+        request.upload_handlers = [ImageUploadHandler(request)]
+        return super().initialize_request(  # type: ignore[misc]
+            request, *args, **kwargs
+        )
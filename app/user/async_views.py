@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.shortcuts import get_object_or_404
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from app.async_api import async_read_view
+from app.user.models import Profile
+from app.user.serializers import ProfileSerializer
+
+
+@async_read_view(authenticated=True)
+def profile_detail(request: Request, user: Any) -> Any:
+    profile = get_object_or_404(
+        Profile.objects.select_related("user"), user=user
+    )
+    if profile.user != request.user:
+        raise exceptions.PermissionDenied()
+    return ProfileSerializer(profile, context={"request": request}).data
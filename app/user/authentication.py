@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from app.user.token import USER_CLAIMS
+
+User = get_user_model()
+
+
+class ActiveUserCache:
+    """
+    Small in-process cache of whether a user may still authenticate, so a
+    deactivated or deleted account is locked out within `ttl` seconds
+    """
+
+    def __init__(self, ttl: int, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def is_active(self, user_id: str) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(user_id)
+                return entry[1]
+        active = User.objects.filter(pk=user_id, is_active=True).exists()
+        with self.lock:
+            self.entries[user_id] = (now + self.ttl, active)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return active
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+active_users = ActiveUserCache(
+    ttl=settings.STATELESS_JWT_USER_TTL,
+    max_entries=settings.STATELESS_JWT_USER_CACHE_SIZE,
+)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates with the user claims signed into the token instead of
+    querying the user on every request. Fields that are not carried by the
+    token stay deferred and are loaded only when accessed.
+    """
+
+    def get_user(self, validated_token: Any) -> Any:
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if not validated_token["is_active"] or not active_users.is_active(
+            user_id
+        ):
+            raise AuthenticationFailed(
+                "User is inactive", code="user_inactive"
+            )
+
+        claims = {"id": user_id}
+        claims.update({claim: validated_token[claim] for claim in USER_CLAIMS})
+        field_names = []
+        values = []
+        for field in User._meta.concrete_fields:
+            if field.attname in claims:
+                field_names.append(field.attname)
+                values.append(field.to_python(claims[field.attname]))
+        return User.from_db(DEFAULT_DB_ALIAS, field_names, values)
@@ -0,0 +1,132 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from app.user.bloom import BloomFilter
+
+FIELDS = ("username", "email")
+
+
+class TakenNames:
+    """
+    Bloom filters of the normalized usernames and emails in use. A miss
+    means the value is free without looking it up; a hit is confirmed
+    with a query. The users saved by other processes are pulled in every
+    `sync_interval` seconds, looking back `sync_lag` seconds for saves
+    committed late; registration enforces uniqueness, so a name taken in
+    between is only refused a little later. The filters are rebuilt in
+    the background every `rebuild_interval` seconds to drop names no
+    longer in use, and every value is looked up until the first build.
+    """
+
+    def __init__(
+        self, rebuild_interval: int, sync_interval: int, sync_lag: int
+    ) -> None:
+        self.rebuild_interval = rebuild_interval
+        self.sync_interval = sync_interval
+        self.sync_lag = timedelta(seconds=sync_lag)
+        self.filters: Optional[Dict[str, BloomFilter]] = None
+        self.synced_at: Optional[datetime] = None
+        self.built_at = 0.0
+        self.checked_at = 0.0
+        self.building = False
+        self.lock = threading.Lock()
+
+    def rebuild(self) -> None:
+        synced_at = timezone.now()
+        users = get_user_model().objects.values_list(
+            Lower("username"), Lower("email")
+        )
+        capacity = max(2 * users.count(), settings.AVAILABILITY_CAPACITY)
+        filters = {field: BloomFilter(capacity) for field in FIELDS}
+        for username, email in users.iterator():
+            filters["username"].add(username)
+            filters["email"].add(email)
+        with self.lock:
+            self.filters = filters
+            self.synced_at = synced_at
+            self.built_at = self.checked_at = time.monotonic()
+
+    def start_rebuild(self) -> None:
+        """
+        Rebuild the filters on a background thread unless one already is
+        """
+        with self.lock:
+            if self.building:
+                return
+            self.building = True
+        if not settings.BACKGROUND_REBUILDS:
+            self._rebuild()
+            return
+        threading.Thread(target=self._rebuild, daemon=True).start()
+
+    def _rebuild(self) -> None:
+        try:
+            self.rebuild()
+        finally:
+            if settings.BACKGROUND_REBUILDS:
+                connections.close_all()
+            with self.lock:
+                self.building = False
+
+    def sync(self) -> None:
+        synced_at = timezone.now()
+        users = get_user_model().objects.filter(
+            updated_at__gte=self.synced_at - self.sync_lag  # type: ignore
+        )
+        for username, email in users.values_list(
+            Lower("username"), Lower("email")
+        ):
+            self.filters["username"].add(username)  # type: ignore[index]
+            self.filters["email"].add(email)  # type: ignore[index]
+        self.synced_at = synced_at
+        self.checked_at = time.monotonic()
+
+    def rebuild_due(self) -> bool:
+        return (
+            self.filters is None
+            or time.monotonic() - self.built_at > self.rebuild_interval
+            or self.filters["username"].count
+            > self.filters["username"].capacity
+        )
+
+    def might_be_taken(self, field: str, value: str) -> bool:
+        if self.rebuild_due():
+            self.start_rebuild()
+        with self.lock:
+            if self.filters is None:
+                return True
+            if time.monotonic() - self.checked_at > self.sync_interval:
+                self.sync()
+            return value in self.filters[field]
+
+    def add(self, username: str, email: str) -> None:
+        with self.lock:
+            if self.filters is not None:
+                self.filters["username"].add(username.lower())
+                self.filters["email"].add(email.lower())
+
+    def is_taken(self, field: str, value: str) -> bool:
+        value = value.strip()
+        if not self.might_be_taken(field, value.lower()):
+            return False
+        lookup: Any = {f"{field}__iexact": value}
+        return get_user_model().objects.filter(**lookup).exists()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.filters = None
+
+
+taken_names = TakenNames(
+    rebuild_interval=settings.AVAILABILITY_REBUILD_INTERVAL,
+    sync_interval=settings.AVAILABILITY_SYNC_INTERVAL,
+    sync_lag=settings.AVAILABILITY_SYNC_LAG,
+)
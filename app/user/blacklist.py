@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from app.user.bloom import BloomFilter
+
+
+class BlacklistFilter:
+    """
+    In-memory prefilter of blacklisted token ids. A token missing from the
+    filter is taken as not blacklisted without a lookup of its jti. The
+    ids this worker blacklists are added at once and the rows added by
+    other workers are pulled in every `sync_interval` seconds. The filter
+    is rebuilt in the background every `rebuild_interval` seconds to drop
+    pruned ids; until it is first built every token is looked up.
+    """
+
+    def __init__(self, rebuild_interval: int, sync_interval: int) -> None:
+        self.rebuild_interval = rebuild_interval
+        self.sync_interval = sync_interval
+        self.filter: Optional[BloomFilter] = None
+        self.last_id = 0
+        self.built_at = 0.0
+        self.synced_at = 0.0
+        self.building = False
+        self.lock = threading.Lock()
+
+    def rebuild(self) -> None:
+        rows = BlacklistedToken.objects.order_by("id").values_list(
+            "id", "token__jti"
+        )
+        capacity = max(2 * rows.count(), settings.TOKEN_BLACKLIST_CAPACITY)
+        bloom = BloomFilter(capacity)
+        last_id = 0
+        for row_id, jti in rows.iterator():
+            bloom.add(jti)
+            last_id = row_id
+        with self.lock:
+            self.filter = bloom
+            self.last_id = last_id
+            self.built_at = self.synced_at = time.monotonic()
+
+    def start_rebuild(self) -> None:
+        """
+        Rebuild the filter on a background thread unless one already is
+        """
+        with self.lock:
+            if self.building:
+                return
+            self.building = True
+        if not settings.BACKGROUND_REBUILDS:
+            self._rebuild()
+            return
+        threading.Thread(target=self._rebuild, daemon=True).start()
+
+    def _rebuild(self) -> None:
+        try:
+            self.rebuild()
+        finally:
+            if settings.BACKGROUND_REBUILDS:
+                connections.close_all()
+            with self.lock:
+                self.building = False
+
+    def sync(self) -> None:
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=self.last_id)
+            .order_by("id")
+            .values_list("id", "token__jti")
+        )
+        for row_id, jti in rows:
+            self.filter.add(jti)  # type: ignore[union-attr]
+            self.last_id = row_id
+        self.synced_at = time.monotonic()
+
+    def rebuild_due(self) -> bool:
+        return (
+            self.filter is None
+            or time.monotonic() - self.built_at > self.rebuild_interval
+            or self.filter.count > self.filter.capacity
+        )
+
+    def might_contain(self, jti: str) -> bool:
+        if self.rebuild_due():
+            self.start_rebuild()
+        with self.lock:
+            if self.filter is None:
+                return True
+            if time.monotonic() - self.synced_at > self.sync_interval:
+                self.sync()
+            return jti in self.filter
+
+    def add(self, jti: str) -> None:
+        with self.lock:
+            if self.filter is not None:
+                self.filter.add(jti)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.filter = None
+            self.last_id = 0
+
+
+blacklisted_tokens = BlacklistFilter(
+    rebuild_interval=settings.TOKEN_BLACKLIST_REBUILD_INTERVAL,
+    sync_interval=settings.TOKEN_BLACKLIST_SYNC_INTERVAL,
+)
@@ -0,0 +1,102 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from app.user.availability import taken_names
+from app.user.models import Profile
+from app.user.serializers import UserSerializer
+
+User = get_user_model()
+
+
+def read_rows(path: str, fmt: str) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="") as source:
+        if fmt == "csv":
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = "Bulk create users and their profiles from a CSV or NDJSON file"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "ndjson"])
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path = options["path"]
+        fmt = options["format"] or (
+            "csv" if path.endswith(".csv") else "ndjson"
+        )
+        rows = read_rows(path, fmt)
+        created = skipped = 0
+        started = time.perf_counter()
+        self.workers = options["workers"] or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                batch = list(islice(rows, options["batch_size"]))
+                if not batch:
+                    break
+                batch_created = self.import_batch(batch, executor)
+                created += batch_created
+                skipped += len(batch) - batch_created
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} users, skipped {skipped} "
+                f"in {elapsed:.2f}s ({created / max(elapsed, 1e-9):.0f}/s)"
+            )
+        )
+
+    def import_batch(
+        self, batch: List[Dict[str, Any]], executor: ProcessPoolExecutor
+    ) -> int:
+        batch = [row for row in batch if UserSerializer(data=row).is_valid()]
+        chunksize = max(1, len(batch) // (self.workers * 4))
+        passwords = executor.map(
+            make_password,
+            [row["password"] for row in batch],
+            chunksize=chunksize,
+        )
+        users = [
+            User(
+                username=row["username"],
+                email=User.objects.normalize_email(row["email"]),
+                password=password,
+            )
+            for row, password in zip(batch, passwords)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            inserted = set(
+                User.objects.filter(
+                    id__in=[user.id for user in users]
+                ).values_list("id", flat=True)
+            )
+            Profile.objects.bulk_create(
+                [
+                    Profile(user_id=user.id, bio=row.get("bio"))
+                    for row, user in zip(batch, users)
+                    if user.id in inserted
+                ]
+            )
+        for user in users:
+            if user.id in inserted:
+                taken_names.add(user.username, user.email)
+        return len(inserted)
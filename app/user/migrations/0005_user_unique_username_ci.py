@@ -0,0 +1,58 @@
+# Generated by Django 4.0.5 on 2026-10-19 11:28
+
+from typing import Any
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def rename_case_duplicates(apps: Any, schema_editor: Any) -> None:
+    """
+    Usernames differing only by case cannot coexist under the new
+    constraint, so all but the oldest of them get a numbered suffix
+    """
+    User = apps.get_model("user", "User")
+    max_length = User._meta.get_field("username").max_length
+    duplicates = (
+        User.objects.annotate(lowered=Lower("username"))
+        .values("lowered")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .values_list("lowered", flat=True)
+    )
+    for lowered in list(duplicates):
+        users = User.objects.filter(username__iexact=lowered).order_by(
+            "created_at", "id"
+        )
+        number = 1
+        for user in users[1:]:
+            while True:
+                number += 1
+                suffix = f"_{number}"
+                username = user.username[: max_length - len(suffix)] + suffix
+                if not User.objects.filter(username__iexact=username).exists():
+                    break
+            user.username = username
+            user.save(update_fields=["username"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0004_profile_image_digest"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            rename_case_duplicates, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("username"),
+                name="unique_username_ci",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.5 on 2026-10-19 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0005_user_unique_username_ci"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["updated_at"], name="user_updated"),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from typing import Any
+
+from django.db import migrations
+
+
+def create_prefix_index(apps: Any, schema_editor: Any) -> None:
+    """
+    Username prefix searches compare lower(username) with LIKE, which a
+    plain index only serves under the C collation. The operator class is
+    specific to Postgres, so other databases go without the index.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX user_username_prefix ON user_user "
+            "(lower(username) text_pattern_ops)"
+        )
+
+
+def drop_prefix_index(apps: Any, schema_editor: Any) -> None:
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS user_username_prefix")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0006_user_updated_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
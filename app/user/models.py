@@ -8,9 +8,13 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.db.models.functions import Lower
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
 from app.abstracts import TimeStampedModel
+from app.user.availability import taken_names
 
 
 class UserManager(BaseUserManager):
@@ -94,10 +98,28 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
     REQUIRED_FIELDS = ["username", "password"]
     USERNAME_FIELD = "email"
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower("username"),
+                name="unique_username_ci",
+            )
+        ]
+        indexes = [models.Index(fields=["updated_at"], name="user_updated")]
+
+
+@receiver(post_save, sender=User)
+def taken_names_post_save(sender: Any, instance: Any, **kwargs: Any) -> None:
+    taken_names.add(instance.username, instance.email)
+
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     image = CloudinaryField("image")
+    image_variants = models.JSONField(default=dict, blank=True)
+    image_digest = models.CharField(
+        max_length=64, blank=True, default="", db_index=True
+    )
     bio = models.CharField(blank=True, max_length=500, null=True)
 
     def __str__(self) -> str:
@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ProfileDirectoryPagination(CursorPagination):
+    """
+    Keyset pagination over the lower-cased username, which is unique
+    """
+
+    ordering = "username_lower"
+    page_size = 20
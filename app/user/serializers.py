@@ -1,15 +1,21 @@
-from typing import Any
+from typing import Any, Optional
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.db import IntegrityError, transaction
 from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import TokenError
 
+from app.images import build_srcset, prepare_image, save_image_variants
 from app.user.models import Profile, UserFollowing
-from app.user.token import account_activation_token
+from app.user.token import UserClaimsRefreshToken, account_activation_token
 from app.user.utils import create_email_data, generate_token, send_email
 from app.user.validators import (
     validate_password_digit,
@@ -20,18 +26,39 @@ from app.user.validators import (
 
 User = get_user_model()
 
+# The fields guarded by each unique constraint, under its name and, for
+# SQLite which reports a column rather than the constraint, its column
+UNIQUE_CONSTRAINT_FIELDS = {
+    "unique_username_ci": "username",
+    "user_user_email_key": "email",
+    "user_user.email": "email",
+}
+
+
+def unique_violation_field(error: IntegrityError) -> Optional[str]:
+    """
+    The field whose unique constraint the error reports, if any
+    """
+    diag = getattr(error.__cause__, "diag", None)
+    name = getattr(diag, "constraint_name", None)
+    if name is not None:
+        return UNIQUE_CONSTRAINT_FIELDS.get(name)
+    message = str(error)
+    for constraint, field in UNIQUE_CONSTRAINT_FIELDS.items():
+        if constraint in message:
+            return field
+    return None
+
 
 class UserSerializer(serializers.ModelSerializer):
     id = serializers.CharField(read_only=True)
     username = serializers.CharField(
         max_length=20,
         min_length=8,
-        validators=[UniqueValidator(queryset=User.objects.all())],
     )
 
     email = serializers.EmailField(
         required=True,
-        validators=[UniqueValidator(queryset=User.objects.all())],
     )
 
     password = serializers.CharField(
@@ -51,9 +78,21 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ("id", "email", "username", "password")
 
     def create(self, validated_data: Any) -> Any:
-        user = User.objects.create_user(**validated_data)
-        user.save()
-        Profile.objects.create(user=user)
+        """
+        Uniqueness of the username and email is enforced by the database
+        constraints rather than checked beforehand
+        """
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(**validated_data)
+                Profile.objects.create(user=user)
+        except IntegrityError as error:
+            field = unique_violation_field(error)
+            if field is None:
+                raise
+            raise serializers.ValidationError(
+                {field: ["This field must be unique."]}, code="unique"
+            )
         token_info = generate_token(user)
         request = self.context.get("request")
         email_data = create_email_data(
@@ -68,6 +107,40 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserClaimsRefreshToken
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UserClaimsRefreshToken
+
+    def validate(self, attrs: Any) -> Any:
+        refresh = self.token_class(attrs["refresh"])
+        refresh.refresh_claims()
+        data = {"access": str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist_once()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class AvailabilitySerializer(serializers.Serializer):
+    username = serializers.CharField(required=False, max_length=150)
+    email = serializers.CharField(required=False, max_length=254)
+
+    def validate(self, attrs: Any) -> Any:
+        if not attrs:
+            raise serializers.ValidationError(
+                "Provide a username or an email to check",
+                code="missing_value",
+            )
+        return attrs
+
+
 class LogoutSerializer(serializers.Serializer):
     refresh = serializers.CharField()
 
@@ -78,7 +151,8 @@ class LogoutSerializer(serializers.Serializer):
     def save(self, **kwargs):  # type:ignore[no-untyped-def]
 
         try:
-            RefreshToken(self.token).blacklist()
+            token = UserClaimsRefreshToken(self.token)
+            token.blacklist_once()
 
         except TokenError:
 
@@ -127,17 +201,30 @@ class ProfileSerializer(serializers.ModelSerializer):
     username = serializers.CharField(read_only=True, source="user.username")
     bio = serializers.CharField(allow_blank=True, required=False)
     image = serializers.ImageField(use_url=True, required=False)
+    image_variants = serializers.JSONField(read_only=True)
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = ("username", "bio", "image")
+        fields = ("username", "bio", "image", "image_variants", "image_srcset")
 
     def update(self, instance: Any, validated_data: Any) -> Any:
+        variants = prepare_image(validated_data)
         instance.bio = validated_data.get("bio", instance.bio)
         instance.image = validated_data.get("image", instance.image)
+        instance.image_digest = validated_data.get(
+            "image_digest", instance.image_digest
+        )
+        instance.image_variants = validated_data.get(
+            "image_variants", instance.image_variants
+        )
         instance.save()
+        save_image_variants(instance, variants)
         return instance
 
+    def get_image_srcset(self, instance: Any) -> Any:
+        return build_srcset(instance.image_variants)
+
 
 class PasswordResetSerializer(serializers.Serializer):
 
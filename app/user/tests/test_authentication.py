@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from faker import Faker
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    TokenError,
+)
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.user.authentication import StatelessJWTAuthentication, active_users
+from app.user.serializers import UserTokenRefreshSerializer
+from app.user.token import UserClaimsRefreshToken
+
+User = get_user_model()
+fake = Faker()
+
+
+class TestStatelessJWTAuthentication(TestCase):
+    """
+    Tests for authenticating from the token claims
+    """
+
+    def setUp(self) -> None:
+        active_users.clear()
+        self.user = User.objects.create_user(
+            username=fake.user_name(),
+            email=fake.email(),
+            password=fake.password(),
+        )
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+        self.request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+    def test_token_carries_user_claims(self) -> None:
+        """
+        Test the issued token contains the user fields
+        """
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+
+        self.assertEqual(token["username"], self.user.username)
+        self.assertFalse(token["is_verified"])
+
+    def test_authenticate_without_user_query(self) -> None:
+        """
+        Test a cached user is authenticated without touching the database
+        """
+        StatelessJWTAuthentication().authenticate(self.request)
+
+        with self.assertNumQueries(0):
+            user, _ = StatelessJWTAuthentication().authenticate(self.request)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.username, self.user.username)
+
+    def test_deferred_fields_are_loaded(self) -> None:
+        """
+        Test fields missing from the token are loaded on access
+        """
+        user, _ = StatelessJWTAuthentication().authenticate(self.request)
+
+        self.assertEqual(user.email, self.user.email)
+
+    def test_inactive_user_is_rejected(self) -> None:
+        """
+        Test a deactivated user can not authenticate once the cache expires
+        """
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            StatelessJWTAuthentication().authenticate(self.request)
+
+    def test_refresh_reloads_claims(self) -> None:
+        """
+        Test a refreshed token carries the user's current fields
+        """
+        refresh = UserClaimsRefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(
+            is_verified=True, is_staff=True
+        )
+
+        serializer = UserTokenRefreshSerializer(data={"refresh": str(refresh)})
+        serializer.is_valid(raise_exception=True)
+
+        for token in (
+            AccessToken(serializer.validated_data["access"]),
+            UserClaimsRefreshToken(serializer.validated_data["refresh"]),
+        ):
+            self.assertTrue(token["is_verified"])
+            self.assertTrue(token["is_staff"])
+
+    def test_refresh_rejects_inactive_user(self) -> None:
+        """
+        Test a deactivated user can not refresh their token
+        """
+        refresh = UserClaimsRefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        serializer = UserTokenRefreshSerializer(data={"refresh": str(refresh)})
+
+        with self.assertRaises(TokenError):
+            serializer.is_valid()
@@ -0,0 +1,80 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from faker import Faker
+
+from app.user.models import Profile
+
+User = get_user_model()
+fake = Faker()
+
+
+class TestImportUsers(TestCase):
+    """
+    Tests for the bulk user import command
+    """
+
+    def test_import_users(self) -> None:
+        """
+        Test users and profiles are created and duplicates skipped
+        """
+        rows = [
+            {
+                "username": fake.unique.pystr(min_chars=8, max_chars=20),
+                "email": fake.unique.email(),
+                "password": fake.password(),
+                "bio": fake.sentence(),
+            }
+            for _ in range(3)
+        ]
+        rows.append(dict(rows[0], email=fake.unique.email()))
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as source:
+            source.write("\n".join(json.dumps(row) for row in rows))
+            source.flush()
+            out = StringIO()
+            call_command(
+                "import_users",
+                source.name,
+                workers=1,
+                batch_size=2,
+                stdout=out,
+            )
+
+        self.assertIn("Created 3 users, skipped 1", out.getvalue())
+        user = User.objects.get(email=rows[1]["email"])
+        self.assertTrue(user.check_password(rows[1]["password"]))
+        self.assertEqual(Profile.objects.get(user=user).bio, rows[1]["bio"])
+
+    def test_invalid_rows_are_skipped(self) -> None:
+        """
+        Test rows failing the registration validators are not imported
+        """
+        rows = [
+            {
+                "username": "short",
+                "email": fake.unique.email(),
+                "password": fake.password(),
+            },
+            {
+                "username": fake.pystr(min_chars=21, max_chars=30),
+                "email": fake.unique.email(),
+                "password": fake.password(),
+            },
+            {
+                "username": fake.unique.pystr(min_chars=8, max_chars=20),
+                "email": "not-an-email",
+                "password": fake.password(),
+            },
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as source:
+            source.write("\n".join(json.dumps(row) for row in rows))
+            source.flush()
+            out = StringIO()
+            call_command("import_users", source.name, workers=1, stdout=out)
+
+        self.assertIn("Created 0 users, skipped 3", out.getvalue())
+        self.assertFalse(User.objects.exists())
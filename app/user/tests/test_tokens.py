@@ -0,0 +1,133 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from faker import Faker
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from app.user.blacklist import blacklisted_tokens
+from app.user.bloom import BloomFilter
+from app.user.serializers import UserTokenRefreshSerializer
+from app.user.token import UserClaimsRefreshToken
+
+User = get_user_model()
+fake = Faker()
+
+
+class TestBloomFilter(TestCase):
+    """
+    Tests for the bloom filter
+    """
+
+    def test_added_items_are_found(self) -> None:
+        bloom = BloomFilter(100)
+        words = [fake.uuid4() for _ in range(100)]
+        bloom.update(words)
+
+        self.assertTrue(all(word in bloom for word in words))
+        misses = [fake.uuid4() in bloom for _ in range(1000)]
+        self.assertLess(sum(misses), 50)
+
+
+class TestTokenBlacklist(TestCase):
+    """
+    Tests for the blacklist prefilter and expired token pruning
+    """
+
+    def setUp(self) -> None:
+        blacklisted_tokens.clear()
+        blacklisted_tokens.rebuild()
+        self.user = User.objects.create_user(
+            username=fake.user_name(),
+            email=fake.email(),
+            password=fake.password(),
+        )
+
+    def test_unlisted_token_skips_database(self) -> None:
+        """
+        Test a token missing from the filter is not looked up
+        """
+        token = UserClaimsRefreshToken.for_user(self.user)
+
+        with self.assertNumQueries(0):
+            UserClaimsRefreshToken(str(token))
+
+    def test_token_blacklisted_by_another_worker(self) -> None:
+        """
+        Test a token blacklisted outside this worker's filter is refused
+        once the filter syncs
+        """
+        token = UserClaimsRefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(
+            token=OutstandingToken.objects.get(jti=token["jti"])
+        )
+        later = time.monotonic() + settings.TOKEN_BLACKLIST_SYNC_INTERVAL + 1
+
+        with patch("app.user.blacklist.time.monotonic", return_value=later):
+            with self.assertRaises(TokenError):
+                UserClaimsRefreshToken(str(token))
+
+    def test_replayed_refresh_is_refused(self) -> None:
+        """
+        Test a refresh token is refused when reused before the filter saw
+        it blacklisted
+        """
+        token = str(UserClaimsRefreshToken.for_user(self.user))
+        first = UserTokenRefreshSerializer(data={"refresh": token})
+        first.is_valid(raise_exception=True)
+        replay = UserTokenRefreshSerializer(data={"refresh": token})
+
+        with patch.object(
+            blacklisted_tokens, "might_contain", return_value=False
+        ):
+            with self.assertRaises(TokenError):
+                replay.is_valid()
+
+    def test_filter_is_built_in_background(self) -> None:
+        """
+        Test tokens are looked up while the filter is being built
+        """
+        blacklisted_tokens.clear()
+        self.addCleanup(setattr, blacklisted_tokens, "building", False)
+
+        with override_settings(BACKGROUND_REBUILDS=True), patch(
+            "app.user.blacklist.threading.Thread"
+        ) as thread:
+            self.assertTrue(blacklisted_tokens.might_contain("jti"))
+
+        thread.return_value.start.assert_called_once()
+
+    def test_blacklisted_token_is_rejected(self) -> None:
+        """
+        Test a blacklisted token is refused after passing the filter
+        """
+        token = UserClaimsRefreshToken.for_user(self.user)
+        token.blacklist()
+
+        with self.assertRaises(TokenError):
+            UserClaimsRefreshToken(str(token))
+
+    def test_prune_expired_tokens(self) -> None:
+        """
+        Test expired tokens are deleted along with their blacklist rows
+        """
+        token = UserClaimsRefreshToken.for_user(self.user)
+        token.blacklist()
+        UserClaimsRefreshToken.for_user(self.user)
+        OutstandingToken.objects.filter(jti=token["jti"]).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+
+        call_command("prune_tokens", batch_size=1)
+
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -1,20 +1,27 @@
 import json
+import time
+from datetime import timedelta
 from typing import Any
 from unittest.mock import patch
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.core import mail
-from django.test import TestCase
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
 from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from faker import Faker
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from app.user.availability import taken_names
 from app.user.models import Profile, UserFollowing
+from app.user.serializers import UserSerializer
 from app.user.token import account_activation_token
 
 from .mocks import test_image, test_user
@@ -59,6 +66,58 @@ class UserRegisterViewsTest(TestCase):
         self.assertEqual(res_data["email"], data["email"])
         self.assertTrue(len(mail.outbox) > 0)
 
+    def test_create_user_duplicate_username(self) -> None:
+        """
+        Test usernames are unique regardless of case
+        """
+        data = {
+            "username": "speaksfer_user",
+            "email": fake.email(),
+            "password": fake.password(),
+        }
+        self.client.post(self.create_url, data, format="json")
+        data.update(username="Speaksfer_User", email=fake.email())
+
+        response = self.client.post(self.create_url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("username", response.json())
+        self.assertEqual(User.objects.filter(email=data["email"]).count(), 0)
+
+    def test_create_user_duplicate_email(self) -> None:
+        """
+        Test a taken email is reported against the email field
+        """
+        data = {
+            "username": "speaksfer_user",
+            "email": self.user.email,
+            "password": fake.password(),
+        }
+
+        response = self.client.post(self.create_url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.json())
+        self.assertNotIn("username", response.json())
+
+    def test_other_integrity_errors_are_raised(self) -> None:
+        """
+        Test a failure other than a taken username or email is not
+        reported as one
+        """
+        data = {
+            "username": "speaksfer_user",
+            "email": fake.email(),
+            "password": fake.password(),
+        }
+        serializer = UserSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        error = IntegrityError("NOT NULL constraint failed: user_profile.bio")
+
+        with patch.object(Profile.objects, "create", side_effect=error):
+            with self.assertRaises(IntegrityError):
+                serializer.save()
+
     def test_new_user_verification(self) -> None:
         """
         Test verification of user
@@ -138,10 +197,14 @@ class TestProfileView(APITestCase):
         token = json.loads(response.content).get("access")
         return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
 
+    @patch(
+        "cloudinary.uploader.upload",
+        return_value={"secure_url": fake.image_url()},
+    )
     @patch(
         "cloudinary.uploader.upload_resource", return_value=fake.image_url()
     )
-    def test_profile_update(self, upload_resource: Any) -> None:
+    def test_profile_update(self, upload_resource: Any, upload: Any) -> None:
         """
         Test updating of profile by user
         """
@@ -163,6 +226,32 @@ class TestProfileView(APITestCase):
         self.assertTrue(upload_resource.called)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    @override_settings(MAX_IMAGE_UPLOAD_SIZE=64)
+    @patch("cloudinary.uploader.upload_resource")
+    def test_profile_update_rejects_large_image(
+        self, upload_resource: Any
+    ) -> None:
+        """
+        Test an oversized image is rejected before it is uploaded
+        """
+        Profile.objects.create(user=self.user_test)
+        url = reverse("profile", kwargs={"user": self.user_test.id})
+        test_image.seek(0)
+
+        response = self.client.patch(
+            url,
+            data=encode_multipart(
+                data={"image": test_image}, boundary=BOUNDARY
+            ),
+            content_type=MULTIPART_CONTENT,
+            **self.bearer_token,
+        )
+
+        self.assertFalse(upload_resource.called)
+        self.assertEqual(
+            response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
 
 class TestPasswordReset(TestCase):
     testuser: dict
@@ -409,3 +498,149 @@ class TestUserFollowingView(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("You already following this user", str(response.data))
+
+
+class TestAvailabilityView(TestCase):
+    """
+    Tests for the username and email availability check
+    """
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="speaksfer_user",
+            email=fake.email(),
+            password=fake.password(),
+        )
+        taken_names.rebuild()
+        self.url = reverse("availability")
+
+    def test_taken_username_and_email(self) -> None:
+        """
+        Test values in use are reported regardless of case
+        """
+        response = self.client.get(
+            self.url,
+            {"username": "Speaksfer_User", "email": self.user.email.upper()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.json()["username"]["available"])
+        self.assertFalse(response.json()["email"]["available"])
+
+    def test_free_username_skips_lookup(self) -> None:
+        """
+        Test a free username is answered from the filter without a query
+        """
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {"username": "free_user_1"})
+
+        self.assertTrue(response.json()["username"]["available"])
+
+    def test_user_saved_by_another_worker(self) -> None:
+        """
+        Test names saved without this worker's signal are seen once the
+        filter syncs, including a save committed after its last sync
+        """
+        User.objects.filter(pk=self.user.pk).update(
+            username="renamed_user",
+            updated_at=timezone.now() - timedelta(seconds=30),
+        )
+        later = time.monotonic() + settings.AVAILABILITY_SYNC_INTERVAL + 1
+
+        with patch("app.user.availability.time.monotonic", return_value=later):
+            response = self.client.get(self.url, {"username": "Renamed_User"})
+
+        self.assertFalse(response.json()["username"]["available"])
+
+    def test_registration_updates_filter(self) -> None:
+        """
+        Test a newly registered username is no longer available
+        """
+        User.objects.create_user(
+            username="new_speaksfer_user",
+            email=fake.email(),
+            password=fake.password(),
+        )
+
+        response = self.client.get(
+            self.url, {"username": "new_speaksfer_user"}
+        )
+
+        self.assertFalse(response.json()["username"]["available"])
+
+    def test_unbuilt_filter_is_not_trusted(self) -> None:
+        """
+        Test values are looked up while the filters are being built
+        """
+        taken_names.clear()
+        self.addCleanup(setattr, taken_names, "building", False)
+
+        with override_settings(BACKGROUND_REBUILDS=True), patch(
+            "app.user.availability.threading.Thread"
+        ) as thread:
+            response = self.client.get(
+                self.url, {"username": "Speaksfer_User"}
+            )
+
+        thread.return_value.start.assert_called_once()
+        self.assertFalse(response.json()["username"]["available"])
+
+    def test_missing_value(self) -> None:
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestProfileDirectoryView(APITestCase):
+    """
+    Tests for the profile directory
+    """
+
+    def setUp(self) -> None:
+        for username in ["writer_one", "Writer_Two", "writer_three", "reader"]:
+            user = User.objects.create_user(
+                username=username, email=fake.email(), password=fake.password()
+            )
+            Profile.objects.create(user=user)
+        self.client.force_authenticate(user)
+        self.url = reverse("profile-directory")
+
+    def test_prefix_search(self) -> None:
+        """
+        Test profiles are matched by username prefix in username order
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"search": "WRITER"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [profile["username"] for profile in response.json()["results"]],
+            ["writer_one", "writer_three", "Writer_Two"],
+        )
+
+    def test_prefix_is_matched_literally(self) -> None:
+        """
+        Test wildcards and the last code point in a prefix are plain text
+        """
+        for search, expected in [
+            ("writer_t", 2),
+            ("w%", 0),
+            ("\U0010ffff", 0),
+        ]:
+            response = self.client.get(self.url, {"search": search})
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.json()["results"]), expected)
+
+    @patch("app.user.pagination.ProfileDirectoryPagination.page_size", 2)
+    def test_keyset_pagination(self) -> None:
+        """
+        Test the next page continues after the last username
+        """
+        response = self.client.get(self.url)
+        next_page = self.client.get(response.json()["next"])
+
+        self.assertEqual(
+            [profile["username"] for profile in next_page.json()["results"]],
+            ["writer_three", "Writer_Two"],
+        )
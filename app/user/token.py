@@ -1,7 +1,17 @@
 from typing import Any
 
+from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.utils.encoding import smart_bytes
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from app.user.blacklist import blacklisted_tokens
+
+User = get_user_model()
+
+USER_CLAIMS = ("username", "is_active", "is_verified", "is_staff")
 
 
 class TokenGenerator(PasswordResetTokenGenerator):
@@ -9,4 +19,54 @@ class TokenGenerator(PasswordResetTokenGenerator):
         return smart_bytes(f"{user.pk}{timestamp}{user.is_verified}")
 
 
+class UserClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user fields needed to authenticate requests
+    without loading the user. Access tokens inherit the claims, which are
+    reloaded from the user on every refresh. Blacklist checks go through
+    the in-memory prefilter first.
+    """
+
+    def check_blacklist(self) -> None:
+        if blacklisted_tokens.might_contain(self[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self) -> Any:
+        blacklisted = super().blacklist()
+        blacklisted_tokens.add(self[api_settings.JTI_CLAIM])
+        return blacklisted
+
+    def blacklist_once(self) -> None:
+        """
+        Blacklist the token, refusing it if it already was. This catches a
+        token replayed before the prefilter synced the blacklisting of
+        another worker, without a lookup of its own.
+        """
+        _, created = self.blacklist()
+        if not created:
+            raise TokenError("Token is blacklisted")
+
+    def refresh_claims(self) -> None:
+        """
+        Copy the current user fields into the token so a refresh does not
+        carry claims that changed since it was issued
+        """
+        user = (
+            User.objects.filter(pk=self[api_settings.USER_ID_CLAIM])
+            .only(*USER_CLAIMS)
+            .first()
+        )
+        if user is None or not user.is_active:
+            raise TokenError("User is inactive or deleted")
+        for claim in USER_CLAIMS:
+            self[claim] = getattr(user, claim)
+
+    @classmethod
+    def for_user(cls, user: Any) -> Any:
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
 account_activation_token = TokenGenerator()
@@ -4,12 +4,15 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from app.user.async_views import profile_detail
 from app.user.views import (
+    AvailabilityView,
     FollowersFollowingView,
     FollowProfile,
     LogoutView,
     PasswordReset,
     ProfileDetailView,
+    ProfileDirectoryView,
     ProfileListView,
     UnFollowProfile,
     UserRegister,
@@ -23,6 +26,7 @@ urlpatterns = [
     path("logout/", LogoutView.as_view(), name="logout"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("register/", UserRegister.as_view(), name="register"),
+    path("availability/", AvailabilityView.as_view(), name="availability"),
     path(
         "email-verify/<str:encoded_pk>/<str:token>/",
         VerifyEmailView.as_view(),
@@ -31,6 +35,11 @@ urlpatterns = [
     path("profile/<str:user>/", ProfileDetailView.as_view(), name="profile"),
     path("users/", UserView.as_view(), name="users"),
     path("profiles/", ProfileListView.as_view(), name="profiles"),
+    path(
+        "profiles/directory/",
+        ProfileDirectoryView.as_view(),
+        name="profile-directory",
+    ),
     path(
         "password-reset/",
         PasswordReset.as_view(),
@@ -48,4 +57,5 @@ urlpatterns = [
     ),
     path("follow/", FollowProfile.as_view(), name="follow"),
     path("unfollow/<str:id>/", UnFollowProfile.as_view(), name="unfollow"),
+    path("async/profile/<str:user>/", profile_detail, name="async-profile"),
 ]
@@ -1,6 +1,7 @@
 from typing import Any
 
 from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, response, status
 from rest_framework.generics import GenericAPIView
@@ -8,11 +9,14 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from app.uploads import ImageUploadMixin
+from app.user.availability import taken_names
 from app.user.models import Profile, UserFollowing
+from app.user.pagination import ProfileDirectoryPagination
 from app.user.permissions import IsUser
 from app.user.serializers import (
+    AvailabilitySerializer,
     FollowersFollowingSerializer,
     LogoutSerializer,
     PasswordResetSerializer,
@@ -22,6 +26,7 @@ from app.user.serializers import (
     VerifyEmailSerializer,
     VerifyPasswordResetSerializer,
 )
+from app.user.token import UserClaimsRefreshToken
 
 User = get_user_model()
 
@@ -33,7 +38,7 @@ class UserRegister(APIView):
         )
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        refresh = RefreshToken.for_user(user)
+        refresh = UserClaimsRefreshToken.for_user(user)
         response = serializer.data
         response["refresh"] = str(refresh)
         response["access"] = str(refresh.access_token)
@@ -41,6 +46,28 @@ class UserRegister(APIView):
         return Response(response, status=status.HTTP_201_CREATED)
 
 
+class AvailabilityView(GenericAPIView):
+    """
+    Check whether a username or email is still free to register
+    """
+
+    serializer_class = AvailabilitySerializer
+
+    def get(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            {
+                field: {
+                    "value": value,
+                    "available": not taken_names.is_taken(field, value),
+                }
+                for field, value in serializer.validated_data.items()
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class VerifyEmailView(GenericAPIView):
     serializer_class = VerifyEmailSerializer
 
@@ -75,7 +102,9 @@ class UserView(generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
 
 
-class ProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProfileDetailView(
+    ImageUploadMixin, generics.RetrieveUpdateDestroyAPIView
+):
     permission_classes = (
         IsAuthenticated,
         IsUser,
@@ -87,8 +116,30 @@ class ProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 class ProfileListView(generics.ListAPIView):
     serializer_class = ProfileSerializer
-    queryset = Profile.objects.all()
+    queryset = Profile.objects.select_related("user")
+    permission_classes = (IsAuthenticated,)
+
+
+class ProfileDirectoryView(generics.ListAPIView):
+    """
+    Browse profiles by username, optionally narrowed to a username prefix.
+    The prefix is matched with LIKE on lower(username), which Postgres
+    serves from the text_pattern_ops index whatever the collation.
+    """
+
+    serializer_class = ProfileSerializer
+    queryset = Profile.objects.select_related("user").annotate(
+        username_lower=Lower("user__username")
+    )
     permission_classes = (IsAuthenticated,)
+    pagination_class = ProfileDirectoryPagination
+
+    def get_queryset(self) -> Any:
+        queryset = super().get_queryset()
+        prefix = self.request.query_params.get("search", "").strip().lower()
+        if prefix:
+            queryset = queryset.filter(username_lower__startswith=prefix)
+        return queryset
 
 
 class PasswordReset(generics.GenericAPIView):
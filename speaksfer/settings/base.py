@@ -11,12 +11,11 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
-from typing import List
+from tempfile import gettempdir
+from typing import List, Tuple
 
-import cloudinary
-import cloudinary.api
-import cloudinary.uploader
 import dj_database_url
 from corsheaders.defaults import default_headers
 from decouple import config
@@ -24,6 +23,11 @@ from decouple import config
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# drf_yasg is only used by the schema views, so it is not an installed app,
+# which would import it and pkg_resources on every boot. Its templates and
+# static files are found by path instead.
+DRF_YASG_DIR = Path(find_spec("drf_yasg").origin).parent  # type: ignore
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
@@ -58,7 +62,6 @@ INSTALLED_APPS = [
     "rest_framework.authtoken",
     "corsheaders",
     "cloudinary",
-    "drf_yasg",
     # App imports
     "app.user",
     "app.articles",
@@ -66,17 +69,33 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "app.middleware.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "app.middleware.ApiExemptSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "app.middleware.ApiExemptCsrfViewMiddleware",
+    "app.middleware.ApiExemptAuthenticationMiddleware",
+    "app.middleware.ApiExemptMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "django.middleware.common.CommonMiddleware",
 ]
 
+# Session, CSRF, authentication and message middleware are skipped under
+# this prefix, which is authenticated with JWT only
+API_PATH_PREFIX = "/api/"
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = config("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_EXCLUDED_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/gzip",
+    "application/zip",
+)
+
 # White listing the localhost:3000 port
 CORS_ORIGIN_WHITELIST = [
     "http://localhost:3000",
@@ -103,7 +122,7 @@ ROOT_URLCONF = "speaksfer.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [DRF_YASG_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -162,6 +181,7 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "static"
+STATICFILES_DIRS = [DRF_YASG_DIR / "static"]
 STATICFILES_STORAGE = "whitenoise.storage.CompressedStaticFilesStorage"
 
 # Default primary key field type
@@ -169,13 +189,30 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedStaticFilesStorage"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Trust the user claims signed into access tokens instead of loading the
+# user on every request; deactivations are picked up within the ttl
+STATELESS_JWT_AUTH = config("STATELESS_JWT_AUTH", default=False, cast=bool)
+STATELESS_JWT_USER_TTL = config("STATELESS_JWT_USER_TTL", default=60, cast=int)
+STATELESS_JWT_USER_CACHE_SIZE = 10000
+
+# orjson backs the JSON renderer when installed; MessagePack is offered
+# to clients that ask for it when msgpack is installed
+API_RENDERER_CLASSES: Tuple[str, ...] = ("app.renderers.FastJSONRenderer",)
+if find_spec("msgpack") is not None:
+    API_RENDERER_CLASSES += ("app.renderers.MessagePackRenderer",)
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "app.user.authentication.StatelessJWTAuthentication"
+        if STATELESS_JWT_AUTH
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
-    "DEFAULT_RENDERER_CLASSES": (
-        "rest_framework.renderers.JSONRenderer",
-        "rest_framework.renderers.BrowsableAPIRenderer",
+    "DEFAULT_RENDERER_CLASSES": API_RENDERER_CLASSES
+    + ("rest_framework.renderers.BrowsableAPIRenderer",),
+    "DEFAULT_PARSER_CLASSES": (
+        "app.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
     "TEST_REQUEST_RENDERER_CLASSES": (
         "rest_framework.renderers.MultiPartRenderer",
@@ -194,8 +231,110 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": False,
+    "TOKEN_OBTAIN_SERIALIZER": "app.user.serializers.UserTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "app.user.serializers.UserTokenRefreshSerializer",
+}
+
+# Refresh token blacklist prefilter. Tokens blacklisted by another worker
+# reach it within TOKEN_BLACKLIST_SYNC_INTERVAL seconds.
+TOKEN_BLACKLIST_CAPACITY = 100000
+TOKEN_BLACKLIST_REBUILD_INTERVAL = 60 * 60
+TOKEN_BLACKLIST_SYNC_INTERVAL = 5
+
+# Rebuild the in-memory prefilters and the front page snapshot on
+# background threads instead of the request that finds them due
+BACKGROUND_REBUILDS = True
+
+# Seconds an author's aggregated profile page stays cached
+PROFILE_PAGE_CACHE_TIMEOUT = 60
+
+# Seconds a shared article payload stays cached
+ARTICLE_CACHE_TIMEOUT = 60
+
+# Seconds an article's statistics stay cached
+ARTICLE_STATS_CACHE_TIMEOUT = 30
+
+# Expensive cached values are rebuilt by one caller at a time. Expired
+# values are served for a while longer to the callers that arrive during
+# the rebuild; the others wait for its result up to SINGLE_FLIGHT_WAIT.
+SINGLE_FLIGHT_STALE_TIMEOUT = 60
+SINGLE_FLIGHT_LOCK_TIMEOUT = 30
+SINGLE_FLIGHT_WAIT = 5
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Trending articles are the most favourited of the last few days
+TRENDING_WINDOW_DAYS = 7
+TRENDING_SIZE = 20
+TRENDING_CACHE_TIMEOUT = 5 * 60
+
+# Tags listed as popular and how long the list stays cached
+POPULAR_TAGS_SIZE = 20
+POPULAR_TAGS_TIMEOUT = 5 * 60
+
+# Seconds the front page snapshot is served before it is rebuilt in the
+# background. Changes to what it shows mark it stale at once, and the
+# next reader rebuilds it after FRONT_PAGE_REFRESH_DELAY seconds.
+FRONT_PAGE_TIMEOUT = 60
+FRONT_PAGE_REFRESH_DELAY = 1
+
+# Threads used by warm_caches to fill the caches after a deploy
+WARM_CACHES_WORKERS = config("WARM_CACHES_WORKERS", default=4, cast=int)
+
+# The OpenAPI schema is rendered once per code version and kept in this
+# directory by generate_schema; the source files are fingerprinted when
+# no version is configured
+CODE_VERSION = config("CODE_VERSION", default=config("SOURCE_VERSION", ""))
+SCHEMA_CACHE_DIR = BASE_DIR / "schema"
+SWAGGER_SETTINGS = {
+    "DEFAULT_AUTO_SCHEMA_CLASS": "app.schema.PayloadAutoSchema",
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+#
+# Hot objects are kept in a small in-process LRU in front of the shared
+# cache: Redis when REDIS_URL is set, files on a developer machine. Shared
+# keys carry the code version so a release never reads payloads pickled
+# by the previous one.
+
+REDIS_URL = config("REDIS_URL", default="")
+if REDIS_URL:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config(
+            "CACHE_DIR", default=str(Path(gettempdir()) / "speaksfer-cache")
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "app.cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"LOCAL_TIMEOUT": 5, "LOCAL_MAX_ENTRIES": 1000},
+    },
+    "shared": {**SHARED_CACHE, "KEY_PREFIX": CODE_VERSION},
+}
+
+# Changes returned per page of the changes feed, and the seconds a change
+# is held back so writes committing late are not skipped by a cursor
+ARTICLE_CHANGES_PAGE_SIZE = 100
+ARTICLE_CHANGES_LAG = 60
+
+# Most articles fetched by one multi-get request
+ARTICLE_BATCH_LIMIT = 100
+
+# Username and email availability prefilter
+AVAILABILITY_CAPACITY = 100000
+AVAILABILITY_REBUILD_INTERVAL = 10 * 60
+AVAILABILITY_SYNC_INTERVAL = 5
+AVAILABILITY_SYNC_LAG = 60
+
 # sendgrid settings
 EMAIL_HOST = "smtp.sendgrid.net"
 EMAIL_HOST_USER = "apikey"
@@ -204,8 +343,21 @@ EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_USER = config("EMAIL_USER", "")
 
-cloudinary.config(
-    cloud_name=config("CLOUDINARY_NAME"),
-    api_key=config("CLOUDINARY_API_KEY"),
-    api_secret=config("CLOUDINARY_API_SECRET"),
+# Read by the cloudinary client itself when it is first imported
+CLOUDINARY = {
+    "cloud_name": config("CLOUDINARY_NAME"),
+    "api_key": config("CLOUDINARY_API_KEY"),
+    "api_secret": config("CLOUDINARY_API_SECRET"),
+}
+
+# Responsive image variants rendered on upload
+IMAGE_VARIANT_WIDTHS = {"thumbnail": 150, "medium": 600, "large": 1200}
+IMAGE_VARIANT_FORMATS = ("webp", "jpeg")
+IMAGE_VARIANT_WORKERS = config("IMAGE_VARIANT_WORKERS", default=2, cast=int)
+IMAGE_UPLOAD_WORKERS = config("IMAGE_UPLOAD_WORKERS", default=2, cast=int)
+
+# Image uploads are streamed to disk and rejected once they pass these limits
+MAX_IMAGE_UPLOAD_SIZE = config(
+    "MAX_IMAGE_UPLOAD_SIZE", default=10 * 1024 * 1024, cast=int
 )
+MAX_IMAGE_DIMENSION = config("MAX_IMAGE_DIMENSION", default=6000, cast=int)
@@ -1,3 +1,22 @@
-from speaksfer.settings.base import ALLOWED_HOSTS  # noqa F401
+from django.core.exceptions import ImproperlyConfigured
+
+from speaksfer.settings.base import (  # noqa F401
+    ALLOWED_HOSTS,
+    API_RENDERER_CLASSES,
+    REDIS_URL,
+    REST_FRAMEWORK,
+)
 
 DEBUG = False
+
+# Every worker must share one cache, or invalidations, locks and warm-ups
+# stop at the worker that made them
+if not REDIS_URL:
+    raise ImproperlyConfigured("REDIS_URL must be set in production")
+
+# Serve only the API renderers so a stray Accept: text/html never builds
+# a browsable API page
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": API_RENDERER_CLASSES,
+}
@@ -0,0 +1,15 @@
+from speaksfer.settings import *  # noqa F403, F401
+
+# Keep the shared tier in process memory so test runs neither leave files
+# behind nor read payloads cached by an earlier run
+CACHES = {
+    "default": {
+        "BACKEND": "app.cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"LOCAL_TIMEOUT": 5, "LOCAL_MAX_ENTRIES": 1000},
+    },
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+# Run rebuilds inline so no thread outlives the test that started it
+BACKGROUND_REBUILDS = False
@@ -13,34 +13,42 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from typing import Any, Callable, Optional
+
 from django.contrib import admin
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Speaksfer API",
-        default_version="v1",
-        description="Documentation for Speaksfer API to enable tracking of the backend in building the application",
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
+
+
+def schema_view(renderer: str) -> Callable[..., Any]:
+    """
+    Build the schema view on its first request, so drf_yasg is not
+    imported when a worker boots
+    """
+    view: Optional[Callable[..., Any]] = None
+
+    def lazy_view(request: Any, *args: Any, **kwargs: Any) -> Any:
+        nonlocal view
+        if view is None:
+            from app.schema import CachedSchemaView
+
+            view = CachedSchemaView.with_ui(renderer, cache_timeout=0)
+        return view(request, *args, **kwargs)
+
+    lazy_view.csrf_exempt = True  # type: ignore[attr-defined]
+    return lazy_view
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("app.urls")),
     path(
         "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
+        schema_view("swagger"),
         name="schema-swagger-ui",
     ),
     path(
         "redoc/",
-        schema_view.with_ui("redoc", cache_timeout=0),
+        schema_view("redoc"),
         name="schema-redoc",
     ),
 ]
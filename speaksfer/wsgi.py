@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "speaksfer.settings")
 
 application = get_wsgi_application()
+
+# Build the in-memory prefilters while the worker starts rather than on
+# its first requests
+from app.user.availability import taken_names  # noqa E402
+from app.user.blacklist import blacklisted_tokens  # noqa E402
+
+blacklisted_tokens.start_rebuild()
+taken_names.start_rebuild()